@@ -5,13 +5,26 @@ Affiliate Link Management Commands
 import discord
 from discord.ext import commands
 import logging
+import re
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Discord allows at most 25 fields per embed
+MAX_LISTED_LINKS = 25
+
+# Exactly "<title> | <description> | <category>", tolerating missing spaces around the pipes
+_DETAILS_RE = re.compile(r'^\s*([^|\s][^|]*?)\s*\|\s*([^|\s][^|]*?)\s*\|\s*([^|\s][^|]*?)\s*$')
+
 class AffiliateCommands(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+    
+    def _invalidate_leaderboard(self):
+        """Make the public leaderboard drop links that were deleted"""
+        analytics = self.bot.get_cog('AnalyticsCommands')
+        if analytics:
+            analytics.invalidate_leaderboard()
         
     @commands.command(name='create', brief='Create a new affiliate link')
     async def create_affiliate_link(self, ctx, affiliate_url: str, *, details: str):
@@ -22,12 +35,12 @@ class AffiliateCommands(commands.Cog):
         """
         try:
             # Parse details
-            parts = details.split(' | ')
-            if len(parts) != 3:
+            match = _DETAILS_RE.match(details)
+            if not match:
                 await ctx.send("❌ Please use format: `!create <url> <title> | <description> | <category>`")
                 return
             
-            title, description, category = [part.strip() for part in parts]
+            title, description, category = match.groups()
             
             # Validate affiliate URL
             is_valid, message = self.bot.affiliate_service.validate_affiliate_url(affiliate_url)
@@ -91,34 +104,34 @@ class AffiliateCommands(commands.Cog):
         Usage: !links [limit]
         """
         try:
-            user_links = await self.bot.database.get_user_links(ctx.author.id)
+            limit = min(max(1, limit or 10), MAX_LISTED_LINKS)
+            user_links = await self.bot.database.get_user_links(ctx.author.id, limit=limit)
             
             if not user_links:
                 await ctx.send("📝 You haven't created any affiliate links yet. Use `!create` to get started!")
                 return
             
-            # Limit results
-            user_links = user_links[:limit]
-            
-            embed = discord.Embed(
-                title=f"🔗 Your Affiliate Links ({len(user_links)} shown)",
-                color=0x0099ff,
-                timestamp=discord.utils.utcnow()
-            )
-            
+            fields = []
             for link in user_links:
                 clicks = link.get('clicks', 0)
                 click_text = f"👆 {clicks} clicks" if clicks > 0 else "👆 No clicks yet"
                 
-                embed.add_field(
-                    name=f"**{link['title']}**",
-                    value=f"Category: {link['category']}\n"
-                          f"ID: `{link['short_id']}`\n"
-                          f"{click_text}",
-                    inline=True
-                )
-            
-            embed.set_footer(text=f"Use !analytics <short_id> for detailed stats")
+                fields.append({
+                    'name': f"**{link['title']}**",
+                    'value': f"Category: {link['category']}\n"
+                             f"ID: `{link['short_id']}`\n"
+                             f"{click_text}",
+                    'inline': True
+                })
+            
+            # Build the embed in one go instead of one add_field call per link
+            embed = discord.Embed.from_dict({
+                'title': f"🔗 Your Affiliate Links ({len(user_links)} shown)",
+                'color': 0x0099ff,
+                'timestamp': discord.utils.utcnow().isoformat(),
+                'fields': fields,
+                'footer': {'text': "Use !analytics <short_id> for detailed stats"}
+            })
             
             await ctx.send(embed=embed)
             
@@ -133,23 +146,14 @@ class AffiliateCommands(commands.Cog):
         Usage: !delete <short_id>
         """
         try:
-            # Get link to verify ownership
-            link_data = await self.bot.database.get_affiliate_link(short_id)
+            # Deactivate the link (soft delete); the owner check is part of the update
+            deleted = await self.bot.database.deactivate_affiliate_link(short_id, ctx.author.id)
             
-            if not link_data:
-                await ctx.send("❌ Link not found.")
+            if not deleted:
+                await ctx.send("❌ Link not found or you don't have permission to delete it.")
                 return
             
-            if link_data['created_by'] != ctx.author.id:
-                await ctx.send("❌ You can only delete your own links.")
-                return
-            
-            # Deactivate the link (soft delete)
-            await self.bot.database.connection.execute(
-                "UPDATE affiliate_links SET is_active = 0 WHERE short_id = ?",
-                (short_id,)
-            )
-            await self.bot.database.connection.commit()
+            self._invalidate_leaderboard()
             
             await ctx.send(f"✅ Affiliate link `{short_id}` has been deleted.")
             logger.info(f"User {ctx.author.id} deleted link {short_id}")
@@ -200,8 +204,8 @@ class AffiliateCommands(commands.Cog):
                 inline=False
             )
             
-            # Get affiliate network info
-            affiliate_info = self.bot.affiliate_service.extract_affiliate_info(link_info['affiliate_url'])
+            # Affiliate network info (memoized by URL, warmed when the link was created)
+            affiliate_info = analytics['affiliate_info']
             embed.add_field(
                 name="Network Info",
                 value=f"**Network:** {affiliate_info.get('network', 'Unknown')}\n"
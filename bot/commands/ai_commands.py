@@ -2,17 +2,65 @@
 AI-Powered Commands using Groq API
 """
 
+import asyncio
 import discord
 from discord.ext import commands
 import logging
 from typing import Optional
 
+from bot.services.groq_service import is_error_response
+from bot.utils.cache import normalize_key
+
 logger = logging.getLogger(__name__)
 
 class AICommands(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         
+        # In-flight Groq requests keyed by command and normalized arguments
+        self._inflight = {}
+        
+        # Fire-and-forget tasks (cache writes), referenced until they finish
+        self._background_tasks = set()
+    
+    def _spawn(self, coro):
+        """Run coro in the background without blocking the command"""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+    
+    async def _coalesce(self, key, request):
+        """Run request once for concurrent identical commands and share its result"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(request())
+            self._inflight[key] = task
+            
+            def forget(done):
+                if self._inflight.get(key) is done:
+                    del self._inflight[key]
+            
+            task.add_done_callback(forget)
+        
+        # Shield so one cancelled caller does not cancel the shared request
+        return await asyncio.shield(task)
+    
+    async def _run_while_thinking(self, ctx, thinking_text, request):
+        """Await request while the thinking message is sent concurrently, then delete it"""
+        thinking_task = asyncio.create_task(ctx.send(thinking_text))
+        try:
+            return await request()
+        finally:
+            thinking_msg = await thinking_task
+            await thinking_msg.delete()
+        
+    async def _refresh_niche(self, niche_key, fetch_and_cache):
+        """Re-run an expired niche analysis in the background"""
+        try:
+            await self._coalesce(('analyze', niche_key), fetch_and_cache)
+        except Exception as e:
+            logger.error(f"Error refreshing niche analysis: {e}")
+        
     @commands.command(name='analyze', brief='AI-powered niche analysis')
     @commands.cooldown(1, 30, commands.BucketType.user)  # 1 use per 30 seconds per user
     async def analyze_niche(self, ctx, *, niche: str):
@@ -22,22 +70,37 @@ class AICommands(commands.Cog):
         Example: !analyze fitness equipment
         """
         try:
-            # Send thinking message
-            thinking_msg = await ctx.send("🤖 Analyzing niche with AI... This may take a moment.")
-            
-            # Check cache first
-            cached_analysis = await self.bot.database.get_cached_niche_analysis(niche.lower())
-            
-            if cached_analysis:
-                response = cached_analysis
-                await thinking_msg.edit(content="🔄 Retrieved from cache!")
-            else:
-                # Get fresh analysis from Groq
-                response = await self.bot.groq_service.analyze_niche(niche)
-                
-                # Cache the result
-                await self.bot.database.cache_niche_analysis(niche.lower(), response)
-                await thinking_msg.delete()
+            # Get fresh analysis from Groq and cache it without waiting on the write;
+            # a failed request is returned but never cached, so a failed background
+            # refresh leaves the stale analysis in place
+            niche_key = normalize_key(niche)
+            
+            async def fetch_and_cache():
+                analysis = await self.bot.groq_service.analyze_niche(niche)
+                if not is_error_response(analysis):
+                    self._spawn(self.bot.database.cache_niche_analysis(niche_key, analysis))
+                return analysis
+            
+            # Send thinking message without holding up the lookup
+            thinking_task = asyncio.create_task(ctx.send("🤖 Analyzing niche with AI... This may take a moment."))
+            cached_analysis = None
+            try:
+                # Check cache first
+                cached_analysis, is_stale = await self.bot.database.get_cached_niche_analysis(niche_key)
+                if cached_analysis:
+                    response = cached_analysis
+                else:
+                    response = await self._coalesce(('analyze', niche_key), fetch_and_cache)
+            finally:
+                thinking_msg = await thinking_task
+                if cached_analysis:
+                    await thinking_msg.edit(content="🔄 Retrieved from cache!")
+                else:
+                    await thinking_msg.delete()
+            
+            # Serve the expired analysis now and refresh it for the next request
+            if cached_analysis and is_stale:
+                self._spawn(self._refresh_niche(niche_key, fetch_and_cache))
             
             # Create embed for better formatting
             embed = discord.Embed(
@@ -65,10 +128,13 @@ class AICommands(commands.Cog):
         Example: !products $100-500 gaming accessories
         """
         try:
-            thinking_msg = await ctx.send("🤖 Finding best products to promote...")
-            
-            response = await self.bot.groq_service.recommend_products(niche, budget)
-            await thinking_msg.delete()
+            response = await self._run_while_thinking(
+                ctx, "🤖 Finding best products to promote...",
+                lambda: self._coalesce(
+                    ('products', normalize_key(niche), normalize_key(budget)),
+                    lambda: self.bot.groq_service.recommend_products(niche, budget)
+                )
+            )
             
             embed = discord.Embed(
                 title=f"💰 Product Recommendations: {niche.title()}",
@@ -98,10 +164,13 @@ class AICommands(commands.Cog):
         Example: !optimize blog fitness wireless earbuds
         """
         try:
-            thinking_msg = await ctx.send("🤖 Generating optimization strategy...")
-            
-            response = await self.bot.groq_service.optimize_content(content_type, niche, product)
-            await thinking_msg.delete()
+            response = await self._run_while_thinking(
+                ctx, "🤖 Generating optimization strategy...",
+                lambda: self._coalesce(
+                    ('optimize', normalize_key(content_type), normalize_key(niche), normalize_key(product)),
+                    lambda: self.bot.groq_service.optimize_content(content_type, niche, product)
+                )
+            )
             
             embed = discord.Embed(
                 title=f"🚀 Content Optimization: {content_type.title()}",
@@ -132,10 +201,13 @@ class AICommands(commands.Cog):
         Example: !compete tech reviews https://example.com
         """
         try:
-            thinking_msg = await ctx.send("🤖 Analyzing competitive landscape...")
-            
-            response = await self.bot.groq_service.analyze_competition(niche, competitor_url)
-            await thinking_msg.delete()
+            response = await self._run_while_thinking(
+                ctx, "🤖 Analyzing competitive landscape...",
+                lambda: self._coalesce(
+                    ('compete', normalize_key(niche), competitor_url),
+                    lambda: self.bot.groq_service.analyze_competition(niche, competitor_url)
+                )
+            )
             
             embed = discord.Embed(
                 title=f"🏁 Competitive Analysis: {niche.title()}",
@@ -165,10 +237,13 @@ class AICommands(commands.Cog):
         Example: !trends home automation
         """
         try:
-            thinking_msg = await ctx.send("🤖 Identifying trending opportunities...")
-            
-            response = await self.bot.groq_service.get_trending_topics(niche)
-            await thinking_msg.delete()
+            response = await self._run_while_thinking(
+                ctx, "🤖 Identifying trending opportunities...",
+                lambda: self._coalesce(
+                    ('trends', normalize_key(niche)),
+                    lambda: self.bot.groq_service.get_trending_topics(niche)
+                )
+            )
             
             embed = discord.Embed(
                 title=f"📈 Trending in {niche.title()}",
@@ -195,8 +270,6 @@ class AICommands(commands.Cog):
         Example: !quick best niches for beginners
         """
         try:
-            thinking_msg = await ctx.send("🤖 Getting quick AI insights...")
-            
             # Create a general analysis prompt
             messages = [
                 {
@@ -209,8 +282,10 @@ class AICommands(commands.Cog):
                 }
             ]
             
-            response = await self.bot.groq_service._make_request(messages, max_tokens=800)
-            await thinking_msg.delete()
+            response = await self._run_while_thinking(
+                ctx, "🤖 Getting quick AI insights...",
+                lambda: self.bot.groq_service._make_request(messages, max_tokens=800)
+            )
             
             embed = discord.Embed(
                 title="🤖 Quick AI Insight",
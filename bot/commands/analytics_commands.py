@@ -2,18 +2,55 @@
 Analytics and Performance Tracking Commands
 """
 
+import csv
 import discord
 from discord.ext import commands
+import io
 import logging
+import time
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Leaderboard rows are reused for this many seconds
+LEADERBOARD_CACHE_SECONDS = 60
+
+# Rank labels for the ten leaderboard rows
+_MEDALS = ('🥇', '🥈', '🥉') + tuple(f'{i}.' for i in range(4, 11))
+
+# (epoch second, YYYYMMDD) of the last date stamp computed
+_today_cache = (0, '')
+
+def today_stamp() -> str:
+    """UTC date as YYYYMMDD, recomputed at most once a minute"""
+    global _today_cache
+    now = int(time.time())
+    if now - _today_cache[0] > 60:
+        _today_cache = (now, datetime.utcnow().strftime('%Y%m%d'))
+    return _today_cache[1]
+
+# Static dashboard field, shared by every !dashboard embed
+_QUICK_ACTIONS_FIELD = {
+    'name': "⚡ Quick Actions",
+    'value': "• `!create` - Create new link\n"
+             "• `!analyze <niche>` - AI analysis\n"
+             "• `!links` - View all links",
+    'inline': False
+}
+
 class AnalyticsCommands(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         
+        # (time bucket, rows) of the last leaderboard aggregation
+        self._leaderboard_cache = None
+    
+    def invalidate_leaderboard(self):
+        """Drop cached leaderboard rows so the next call re-aggregates"""
+        self._leaderboard_cache = None
+        
     @commands.command(name='dashboard', brief='View your affiliate dashboard')
+    @commands.cooldown(1, 10, commands.BucketType.user)
     async def dashboard(self, ctx):
         """
         View your complete affiliate marketing dashboard
@@ -22,20 +59,14 @@ class AnalyticsCommands(commands.Cog):
         try:
             dashboard_data = await self.bot.affiliate_service.get_user_dashboard(ctx.author.id)
             
-            embed = discord.Embed(
-                title=f"📊 {ctx.author.display_name}'s Affiliate Dashboard",
-                color=0x0099ff,
-                timestamp=discord.utils.utcnow()
-            )
-            
             # Overview stats
-            embed.add_field(
-                name="📈 Overview",
-                value=f"**Total Links:** {dashboard_data['total_links']}\n"
-                      f"**Total Clicks:** {dashboard_data['total_clicks']}\n"
-                      f"**Avg Clicks/Link:** {dashboard_data['average_clicks_per_link']:.1f}",
-                inline=True
-            )
+            fields = [{
+                'name': "📈 Overview",
+                'value': f"**Total Links:** {dashboard_data['total_links']}\n"
+                         f"**Total Clicks:** {dashboard_data['total_clicks']}\n"
+                         f"**Avg Clicks/Link:** {dashboard_data['average_clicks_per_link']:.1f}",
+                'inline': True
+            }]
             
             # Top performing links
             if dashboard_data['top_performing']:
@@ -43,11 +74,11 @@ class AnalyticsCommands(commands.Cog):
                 for i, link in enumerate(dashboard_data['top_performing'][:3], 1):
                     top_links_text += f"{i}. **{link['title']}** ({link['clicks']} clicks)\n"
                 
-                embed.add_field(
-                    name="🏆 Top Performers",
-                    value=top_links_text or "No clicks yet",
-                    inline=True
-                )
+                fields.append({
+                    'name': "🏆 Top Performers",
+                    'value': top_links_text or "No clicks yet",
+                    'inline': True
+                })
             
             # Recent activity
             if dashboard_data['recent_links']:
@@ -55,20 +86,21 @@ class AnalyticsCommands(commands.Cog):
                 for link in dashboard_data['recent_links'][:3]:
                     recent_text += f"• **{link['title']}** ({link['clicks']} clicks)\n"
                 
-                embed.add_field(
-                    name="🕒 Recent Links",
-                    value=recent_text,
-                    inline=True
-                )
+                fields.append({
+                    'name': "🕒 Recent Links",
+                    'value': recent_text,
+                    'inline': True
+                })
             
             # Quick actions
-            embed.add_field(
-                name="⚡ Quick Actions",
-                value="• `!create` - Create new link\n"
-                      "• `!analyze <niche>` - AI analysis\n"
-                      "• `!links` - View all links",
-                inline=False
-            )
+            fields.append(_QUICK_ACTIONS_FIELD)
+            
+            embed = discord.Embed.from_dict({
+                'title': f"📊 {ctx.author.display_name}'s Affiliate Dashboard",
+                'color': 0x0099ff,
+                'timestamp': discord.utils.utcnow().isoformat(),
+                'fields': fields
+            })
             
             await ctx.send(embed=embed)
             logger.info(f"User {ctx.author.id} viewed dashboard")
@@ -78,6 +110,7 @@ class AnalyticsCommands(commands.Cog):
             await ctx.send("❌ Error loading dashboard. Please try again.")
     
     @commands.command(name='analytics', brief='Detailed analytics for a link')
+    @commands.cooldown(1, 10, commands.BucketType.user)
     async def detailed_analytics(self, ctx, short_id: str):
         """
         Get detailed analytics for a specific link
@@ -158,35 +191,19 @@ class AnalyticsCommands(commands.Cog):
             await ctx.send("❌ Error loading analytics. Please try again.")
     
     @commands.command(name='leaderboard', brief='See top performers')
+    @commands.cooldown(1, 30, commands.BucketType.default)  # Global: one aggregation per 30 seconds
     async def leaderboard(self, ctx):
         """
         View leaderboard of top performing links (public)
         Usage: !leaderboard
         """
         try:
-            # Get top links across all users (you might want to make this configurable)
-            cursor = await self.bot.database.connection.execute(
-                """
-                SELECT 
-                    al.title,
-                    al.category,
-                    u.display_name as creator,
-                    COUNT(ct.id) as clicks
-                FROM affiliate_links al
-                LEFT JOIN click_tracking ct ON al.id = ct.link_id
-                LEFT JOIN (
-                    SELECT DISTINCT created_by, 'Anonymous' as display_name 
-                    FROM affiliate_links
-                ) u ON al.created_by = u.created_by
-                WHERE al.is_active = 1
-                GROUP BY al.id
-                HAVING clicks > 0
-                ORDER BY clicks DESC
-                LIMIT 10
-                """
-            )
-            
-            rows = await cursor.fetchall()
+            bucket = int(time.monotonic()) // LEADERBOARD_CACHE_SECONDS
+            if self._leaderboard_cache and self._leaderboard_cache[0] == bucket:
+                rows = self._leaderboard_cache[1]
+            else:
+                rows = await self.bot.database.get_leaderboard_links()
+                self._leaderboard_cache = (bucket, rows)
             
             if not rows:
                 await ctx.send("📊 No data available for leaderboard yet.")
@@ -199,13 +216,11 @@ class AnalyticsCommands(commands.Cog):
                 timestamp=discord.utils.utcnow()
             )
             
-            for i, (title, category, creator, clicks) in enumerate(rows, 1):
-                medal = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else f"{i}."
-                
+            for i, (title, category, creator, clicks) in enumerate(rows):
                 embed.add_field(
-                    name=f"{medal} {title}",
+                    name=f"{_MEDALS[i]} {title}",
                     value=f"**Category:** {category}\n**Clicks:** {clicks}",
-                    inline=True if i <= 6 else False
+                    inline=i < 6
                 )
             
             embed.set_footer(text="Create your own tracked links with !create")
@@ -230,16 +245,19 @@ class AnalyticsCommands(commands.Cog):
                 await ctx.send("📝 No data to export.")
                 return
             
-            # Create a simple CSV-like format
-            export_text = "Title,Category,Short_ID,Clicks,Created_Date\n"
-            
-            for link in user_links:
-                export_text += f"\"{link['title']}\",\"{link['category']}\",{link['short_id']},{link['clicks']},{link['created_at']}\n"
+            # Write rows as properly quoted CSV
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(['Title', 'Category', 'Short_ID', 'Clicks', 'Created_Date'])
+            writer.writerows(
+                (link['title'], link['category'], link['short_id'], link['clicks'], link['created_at'])
+                for link in user_links
+            )
             
             # Send as a file
             file = discord.File(
-                filename=f"affiliate_links_{ctx.author.id}_{datetime.now().strftime('%Y%m%d')}.csv",
-                fp=discord.utils.StringIO(export_text)
+                filename=f"affiliate_links_{ctx.author.id}_{today_stamp()}.csv",
+                fp=io.BytesIO(buffer.getvalue().encode('utf-8'))
             )
             
             embed = discord.Embed(
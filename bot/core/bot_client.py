@@ -8,33 +8,56 @@ import asyncio
 import logging
 from typing import Optional
 
-from bot.commands.affiliate_commands import AffiliateCommands
-from bot.commands.ai_commands import AICommands
-from bot.commands.analytics_commands import AnalyticsCommands
-from bot.commands.help_commands import HelpCommands
+from bot.core import http
 from bot.core.database import Database
 from bot.services.groq_service import GroqService
 from bot.services.affiliate_service import AffiliateService
 
 logger = logging.getLogger(__name__)
 
+# Discord accepts at most 10 embeds per message
+MAX_EMBEDS_PER_MESSAGE = 10
+# How long click notifications are collected before being sent together
+NOTIFY_BATCH_SECONDS = 1.0
+
 class AffiliateBot(commands.Bot):
     def __init__(self, command_prefix: str, intents: discord.Intents,
                  database: Database, groq_service: GroqService, 
                  affiliate_service: AffiliateService):
-        super().__init__(command_prefix=command_prefix, intents=intents)
+        # HelpCommands provides !help, so drop the built-in one
+        super().__init__(command_prefix=command_prefix, intents=intents, help_command=None)
         
         self.database = database
         self.groq_service = groq_service
         self.affiliate_service = affiliate_service
         
+        # Click notifications are queued and sent in batches by a worker task
+        self._notify_queue: asyncio.Queue = asyncio.Queue()
+        self._notify_task: Optional[asyncio.Task] = None
+        
+        # Preconnect to Groq in the background during startup
+        self._warm_up_task: Optional[asyncio.Task] = None
+        
+        logger.info("✅ Bot client initialized")
+    
+    async def setup_hook(self):
+        """Register command groups before the bot connects"""
+        # Imported here so importing the client module stays cheap
+        from bot.commands.affiliate_commands import AffiliateCommands
+        from bot.commands.ai_commands import AICommands
+        from bot.commands.analytics_commands import AnalyticsCommands
+        from bot.commands.help_commands import HelpCommands
+        
         # Add command groups
-        self.add_cog(AffiliateCommands(self))
-        self.add_cog(AICommands(self))
-        self.add_cog(AnalyticsCommands(self))
-        self.add_cog(HelpCommands(self))
+        await self.add_cog(AffiliateCommands(self))
+        await self.add_cog(AICommands(self))
+        await self.add_cog(AnalyticsCommands(self))
+        await self.add_cog(HelpCommands(self))
+        
+        logger.info("✅ All command groups loaded")
         
-        logger.info("✅ Bot client initialized with all command groups")
+        self._notify_task = asyncio.create_task(self._notify_worker())
+        self._warm_up_task = asyncio.create_task(self.groq_service.warm_up())
     
     async def on_ready(self):
         """Called when bot is ready"""
@@ -48,17 +71,20 @@ class AffiliateBot(commands.Bot):
         )
         await self.change_presence(activity=activity)
         
-        print("\n" + "="*50)
-        print("🚀 DISCORD AFFILIATE MARKETING BOT READY!")
-        print("="*50)
-        print(f"Bot Name: {self.user.name}")
-        print(f"Bot ID: {self.user.id}")
-        print(f"Guilds: {len(self.guilds)}")
-        print(f"Commands: {len(self.commands)}")
-        print("\n📋 Available Commands:")
-        for command in self.commands:
-            print(f"   !{command.name} - {command.brief or 'No description'}")
-        print("="*50)
+        # Build the banner first so it goes out in a single write
+        lines = [
+            "\n" + "="*50,
+            "🚀 DISCORD AFFILIATE MARKETING BOT READY!",
+            "="*50,
+            f"Bot Name: {self.user.name}",
+            f"Bot ID: {self.user.id}",
+            f"Guilds: {len(self.guilds)}",
+            f"Commands: {len(self.commands)}",
+            "\n📋 Available Commands:"
+        ]
+        lines.extend(f"   !{command.name} - {command.brief or 'No description'}" for command in self.commands)
+        lines.append("="*50)
+        print("\n".join(lines))
     
     async def on_command_error(self, ctx, error):
         """Handle command errors"""
@@ -117,13 +143,55 @@ class AffiliateBot(commands.Bot):
                             inline=True
                         )
                     
-                    await channel.send(embed=embed)
+                    # Queued rather than sent so click tracking never waits on Discord
+                    self._notify_queue.put_nowait((channel, embed))
                     
         except Exception as e:
             logger.error(f"Error sending click notification: {e}")
     
+    async def _notify_worker(self):
+        """Send queued click notifications, several embeds per message"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._notify_queue.get()]
+            
+            # Collect whatever else arrives shortly after the first one
+            deadline = loop.time() + NOTIFY_BATCH_SECONDS
+            while len(batch) < MAX_EMBEDS_PER_MESSAGE:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._notify_queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            embeds_by_channel = {}
+            for channel, embed in batch:
+                embeds_by_channel.setdefault(channel, []).append(embed)
+            
+            for channel, embeds in embeds_by_channel.items():
+                await self._send_notifications(channel, embeds)
+    
+    async def _send_notifications(self, channel, embeds: list):
+        """Send one batch of notification embeds, waiting out rate limits"""
+        while True:
+            try:
+                await channel.send(embeds=embeds)
+                return
+            except discord.RateLimited as e:
+                logger.warning(f"Click notifications rate limited, retrying in {e.retry_after:.1f}s")
+                await asyncio.sleep(e.retry_after)
+            except Exception as e:
+                logger.error(f"Error sending click notification: {e}")
+                return
+    
     async def close(self):
         """Cleanup when bot shuts down"""
+        if self._notify_task:
+            self._notify_task.cancel()
+        
+        await http.close_session()
         await self.database.close()
         await super().close()
         logger.info("🔴 Bot disconnected and database closed")
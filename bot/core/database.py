@@ -4,24 +4,128 @@ Database management for affiliate tracking and analytics
 
 import aiosqlite
 import asyncio
+import contextlib
 import logging
-from datetime import datetime, timedelta
+from collections import Counter
 from typing import Dict, List, Optional, Tuple
 import json
 
+from bot.utils.cache import TTLCache
+
 logger = logging.getLogger(__name__)
 
+# Most clicks written in one transaction by the click flusher
+CLICK_BATCH_SIZE = 200
+
+# Read-only connections so analytics queries don't queue behind writes
+READ_POOL_SIZE = 4
+
+# In-memory read caches; SQLite stays the source of truth
+LINK_CACHE_SIZE = 10_000
+
+# Link entries are evicted on deactivation only within this process; the bot
+# and the click server each hold their own, so a link deleted through one can
+# keep resolving in the other until its entry expires. Keep that window short:
+# long enough to absorb a burst of clicks on a hot link, no longer
+LINK_CACHE_SECONDS = 5
+NICHE_CACHE_SIZE = 1_000
+
+# Expired niche analyses are still served (and refreshed) for this long after expiry
+NICHE_MAX_STALE_HOURS = 6 * 24
+
 class Database:
+    # Soft delete restricted to the owner; one constant string keeps the statement cache warm
+    _DEACTIVATE_LINK_SQL = (
+        "UPDATE affiliate_links SET is_active = 0 "
+        "WHERE short_id = ? AND created_by = ? AND is_active = 1"
+    )
+    
+    # Statements run for every click batch
+    _INSERT_CLICK_SQL = (
+        "INSERT INTO click_tracking (link_id, user_id, ip_address, user_agent, referrer) "
+        "VALUES (?, ?, ?, ?, ?)"
+    )
+    _UPSERT_PERFORMANCE_SQL = (
+        "INSERT INTO link_performance (link_id, date, clicks) VALUES (?, DATE('now'), ?) "
+        "ON CONFLICT(link_id, date) DO UPDATE SET clicks = clicks + excluded.clicks"
+    )
+    
     def __init__(self, db_path: str = "affiliate_bot.db"):
         self.db_path = db_path
         self.connection = None
+        
+        # Held for each transaction on the writer, so one caller's commit or
+        # rollback never takes in another's half-done writes
+        self._write_lock = asyncio.Lock()
+        
+        # Active links by short ID, (id, affiliate_url) pairs for click redirects,
+        # and niche analyses
+        self._link_cache = TTLCache(LINK_CACHE_SIZE)
+        self._redirect_cache = TTLCache(LINK_CACHE_SIZE)
+        self._niche_cache = TTLCache(NICHE_CACHE_SIZE)
+        
+        # Idle read-only connections (None for in-memory databases)
+        self._read_pool: Optional[asyncio.Queue] = None
+        
+        # Pending clicks, written in batches by a background flusher
+        self._click_queue: Optional[asyncio.Queue] = None
+        self._flusher_task: Optional[asyncio.Task] = None
     
     async def initialize(self):
         """Initialize database connection and create tables"""
-        self.connection = await aiosqlite.connect(self.db_path)
+        self.connection = await aiosqlite.connect(self.db_path, cached_statements=512)
+        # Rows support name lookup, so results convert straight to dicts
+        self.connection.row_factory = aiosqlite.Row
+        await self._configure_connection()
         await self._create_tables()
+        await self._open_read_pool()
+        
+        self._click_queue = asyncio.Queue()
+        self._flusher_task = asyncio.create_task(self._flush_clicks_loop())
+        self._flusher_task.add_done_callback(self._on_flusher_done)
         logger.info("✅ Database initialized")
     
+    async def _configure_connection(self):
+        """Apply SQLite pragmas for concurrent reads and cheaper commits"""
+        pragmas = [
+            "PRAGMA journal_mode=WAL",
+            "PRAGMA synchronous=NORMAL",
+            "PRAGMA temp_store=MEMORY",
+            "PRAGMA mmap_size=268435456",
+            "PRAGMA cache_size=-65536",
+            "PRAGMA foreign_keys=ON"
+        ]
+        
+        for pragma_sql in pragmas:
+            await self.connection.execute(pragma_sql)
+    
+    async def _open_read_pool(self):
+        """Open read-only connections beside the writer (WAL lets them read during writes)"""
+        # Every connection to :memory: would get its own empty database
+        if self.db_path == ":memory:":
+            return
+        
+        self._read_pool = asyncio.Queue()
+        for _ in range(READ_POOL_SIZE):
+            conn = await aiosqlite.connect(self.db_path, cached_statements=512)
+            conn.row_factory = aiosqlite.Row
+            for pragma_sql in ("PRAGMA query_only=1", "PRAGMA cache_size=-65536", "PRAGMA mmap_size=268435456"):
+                await conn.execute(pragma_sql)
+            self._read_pool.put_nowait(conn)
+    
+    @contextlib.asynccontextmanager
+    async def _acquire_read(self):
+        """Borrow a read-only connection, or the writer when there is no pool"""
+        if self._read_pool is None:
+            yield self.connection
+            return
+        
+        conn = await self._read_pool.get()
+        try:
+            yield conn
+        finally:
+            self._read_pool.put_nowait(conn)
+    
     async def _create_tables(self):
         """Create necessary database tables"""
         tables = [
@@ -92,9 +196,38 @@ class Database:
             """
         ]
         
+        indexes = [
+            # One cache row per niche so analyses can be upserted
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_niche_query ON niche_analysis_cache(niche_query)",
+            
+            # Per-link stats over a time window (also serves plain link_id joins)
+            "CREATE INDEX IF NOT EXISTS idx_click_link_time ON click_tracking(link_id, clicked_at)",
+            
+            # Unique-user counts per link without touching the table rows
+            "CREATE INDEX IF NOT EXISTS idx_click_link_user ON click_tracking(link_id, user_id)",
+            
+            # A creator's active links (dashboard, listings, top links)
+            "CREATE INDEX IF NOT EXISTS idx_links_creator_active ON affiliate_links(created_by, is_active)",
+            
+            # Active link scans (leaderboard)
+            "CREATE INDEX IF NOT EXISTS idx_al_active ON affiliate_links(is_active, id)"
+        ]
+        
         for table_sql in tables:
             await self.connection.execute(table_sql)
         
+        # Older databases may hold several rows per niche; keep the newest
+        await self.connection.execute(
+            """
+            DELETE FROM niche_analysis_cache WHERE id NOT IN (
+                SELECT MAX(id) FROM niche_analysis_cache GROUP BY niche_query
+            )
+            """
+        )
+        
+        for index_sql in indexes:
+            await self.connection.execute(index_sql)
+        
         await self.connection.commit()
         logger.info("✅ Database tables created/verified")
     
@@ -102,156 +235,330 @@ class Database:
                                   affiliate_url: str, title: str, description: str,
                                   category: str, created_by: int) -> int:
         """Create a new affiliate link"""
-        cursor = await self.connection.execute(
-            """
-            INSERT INTO affiliate_links 
-            (short_id, original_url, affiliate_url, title, description, category, created_by)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-            (short_id, original_url, affiliate_url, title, description, category, created_by)
-        )
-        await self.connection.commit()
+        async with self._write_lock:
+            cursor = await self.connection.execute(
+                """
+                INSERT INTO affiliate_links 
+                (short_id, original_url, affiliate_url, title, description, category, created_by)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                (short_id, original_url, affiliate_url, title, description, category, created_by)
+            )
+            await self.connection.commit()
         return cursor.lastrowid
     
-    async def get_affiliate_link(self, short_id: str) -> Optional[Dict]:
-        """Get affiliate link by short ID"""
-        cursor = await self.connection.execute(
-            "SELECT * FROM affiliate_links WHERE short_id = ? AND is_active = 1",
-            (short_id,)
-        )
-        row = await cursor.fetchone()
-        if row:
-            columns = [description[0] for description in cursor.description]
-            return dict(zip(columns, row))
-        return None
+    async def get_affiliate_link(self, short_id: str, created_by: Optional[int] = None) -> Optional[Dict]:
+        """Get affiliate link by short ID, optionally only if owned by created_by"""
+        link = self._link_cache.get(short_id)
+        if link is None:
+            async with self._acquire_read() as conn:
+                cursor = await conn.execute(
+                    "SELECT * FROM affiliate_links WHERE short_id = ? AND is_active = 1",
+                    (short_id,)
+                )
+                row = await cursor.fetchone()
+            if not row:
+                return None
+            
+            link = dict(row)
+            self._link_cache.set(short_id, link, LINK_CACHE_SECONDS)
+        
+        if created_by is not None and link['created_by'] != created_by:
+            return None
+        
+        # Copy so callers never mutate the cached entry
+        return dict(link)
+    
+    async def get_link_for_redirect(self, short_id: str) -> Optional[Tuple[int, str]]:
+        """Get just (id, affiliate_url) of an active link, for the click redirect path"""
+        target = self._redirect_cache.get(short_id)
+        if target is not None:
+            return target
+        
+        link = self._link_cache.get(short_id)
+        if link is not None:
+            return link['id'], link['affiliate_url']
+        
+        async with self._acquire_read() as conn:
+            cursor = await conn.execute(
+                "SELECT id, affiliate_url FROM affiliate_links WHERE short_id = ? AND is_active = 1",
+                (short_id,)
+            )
+            row = await cursor.fetchone()
+        if not row:
+            return None
+        
+        target = (row[0], row[1])
+        self._redirect_cache.set(short_id, target, LINK_CACHE_SECONDS)
+        return target
+    
+    async def deactivate_affiliate_link(self, short_id: str, created_by: int) -> bool:
+        """Soft delete a link owned by created_by; False if not found or not owned"""
+        async with self._write_lock:
+            cursor = await self.connection.execute(self._DEACTIVATE_LINK_SQL, (short_id, created_by))
+            await self.connection.commit()
+        
+        if cursor.rowcount > 0:
+            self._link_cache.pop(short_id)
+            self._redirect_cache.pop(short_id)
+            return True
+        return False
     
     async def track_click(self, link_id: int, user_id: Optional[int] = None,
                          ip_address: Optional[str] = None, user_agent: Optional[str] = None,
                          referrer: Optional[str] = None) -> int:
-        """Track a click on an affiliate link"""
-        cursor = await self.connection.execute(
-            """
-            INSERT INTO click_tracking 
-            (link_id, user_id, ip_address, user_agent, referrer)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (link_id, user_id, ip_address, user_agent, referrer)
-        )
-        await self.connection.commit()
+        """Track a click on an affiliate link
         
-        # Update daily performance
-        await self._update_daily_performance(link_id)
+        The click is queued and written together with any other pending clicks
+        in one transaction; this returns the click ID once that batch is committed.
+        """
+        row = (link_id, user_id, ip_address, user_agent, referrer)
+        written = asyncio.get_running_loop().create_future()
+        self._enqueue_click(row, written)
+        return await written
+    
+    def queue_click(self, link_id: int, user_id: Optional[int] = None,
+                    ip_address: Optional[str] = None, user_agent: Optional[str] = None,
+                    referrer: Optional[str] = None):
+        """Queue a click for the next batch without waiting for it to be written"""
+        row = (link_id, user_id, ip_address, user_agent, referrer)
+        self._enqueue_click(row, None)
+    
+    def _enqueue_click(self, row: Tuple, written: Optional[asyncio.Future]):
+        """Hand a click to the flusher; raises if it is not running to write it"""
+        if self._flusher_task is None or self._flusher_task.done():
+            raise RuntimeError("Click writer is not running")
+        self._click_queue.put_nowait((row, written))
+    
+    @staticmethod
+    def _fail_clicks(batch: List[Tuple[Tuple, Optional[asyncio.Future]]], error: BaseException):
+        """Fail the futures of clicks in batch that have not been resolved yet"""
+        for _, written in batch:
+            if written is not None and not written.done():
+                written.set_exception(error)
+    
+    def _on_flusher_done(self, task: asyncio.Task):
+        """Fail clicks still queued when the flusher stops, so no caller waits forever"""
+        pending = []
+        while not self._click_queue.empty():
+            item = self._click_queue.get_nowait()
+            if item is not None:
+                pending.append(item)
         
-        return cursor.lastrowid
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Click writer stopped: {task.exception()}")
+        self._fail_clicks(pending, RuntimeError("Click writer stopped"))
     
-    async def _update_daily_performance(self, link_id: int):
-        """Update daily performance statistics"""
-        today = datetime.now().date()
-        await self.connection.execute(
-            """
-            INSERT INTO link_performance (link_id, date, clicks)
-            VALUES (?, ?, 1)
-            ON CONFLICT(link_id, date) 
-            DO UPDATE SET clicks = clicks + 1
-            """,
-            (link_id, today)
-        )
-        await self.connection.commit()
+    async def _flush_clicks_loop(self):
+        """Write queued clicks in batches until a None sentinel arrives"""
+        running = True
+        while running:
+            batch = [await self._click_queue.get()]
+            
+            # Take whatever else piled up while the previous batch was written
+            while len(batch) < CLICK_BATCH_SIZE and not self._click_queue.empty():
+                batch.append(self._click_queue.get_nowait())
+            
+            if None in batch:
+                running = False
+                batch = [item for item in batch if item is not None]
+            
+            if batch:
+                try:
+                    await self._write_clicks(batch)
+                finally:
+                    # No-op once written; covers a write that raised or was cancelled
+                    self._fail_clicks(batch, RuntimeError("Click batch was not written"))
+    
+    async def _write_clicks(self, batch: List[Tuple[Tuple, Optional[asyncio.Future]]]):
+        """Insert a batch of clicks and their daily totals with a single commit"""
+        rows = [row for row, _ in batch]
+        async with self._write_lock:
+            try:
+                await self.connection.executemany(self._INSERT_CLICK_SQL, rows)
+                
+                # Rows of one transaction get consecutive IDs ending at the last
+                # insert; the write lock keeps other inserts out of it
+                cursor = await self.connection.execute("SELECT last_insert_rowid()")
+                last_id = (await cursor.fetchone())[0]
+                
+                # Update daily performance
+                await self._update_daily_performance(Counter(row[0] for row in rows))
+                
+                await self.connection.commit()
+            except Exception as e:
+                logger.error(f"Error writing {len(batch)} clicks: {e}")
+                self._fail_clicks(batch, e)
+                await self.connection.rollback()
+                return
+        
+        first_id = last_id - len(batch) + 1
+        for offset, (_, written) in enumerate(batch):
+            if written is not None and not written.done():
+                written.set_result(first_id + offset)
+    
+    async def _update_daily_performance(self, clicks_by_link: Counter):
+        """Add click counts to today's (UTC) performance rows (commit is left to the caller)"""
+        await self.connection.executemany(self._UPSERT_PERFORMANCE_SQL, clicks_by_link.items())
     
     async def get_click_stats(self, link_id: int, days: int = 30) -> Dict:
         """Get click statistics for a link"""
-        start_date = datetime.now() - timedelta(days=days)
-        
-        cursor = await self.connection.execute(
-            """
-            SELECT 
-                COUNT(*) as total_clicks,
-                COUNT(DISTINCT DATE(clicked_at)) as active_days,
-                COUNT(DISTINCT user_id) as unique_users
-            FROM click_tracking 
-            WHERE link_id = ? AND clicked_at >= ?
-            """,
-            (link_id, start_date)
-        )
-        row = await cursor.fetchone()
+        async with self._acquire_read() as conn:
+            cursor = await conn.execute(
+                """
+                SELECT 
+                    COUNT(*) as total_clicks,
+                    COUNT(DISTINCT DATE(clicked_at)) as active_days,
+                    COUNT(DISTINCT user_id) as unique_users
+                FROM click_tracking 
+                WHERE link_id = ? AND clicked_at >= datetime('now', ?)
+                """,
+                (link_id, f'-{days} days')
+            )
+            row = await cursor.fetchone()
         
         if row:
-            return {
-                'total_clicks': row[0],
-                'active_days': row[1], 
-                'unique_users': row[2]
-            }
+            return dict(row)
         return {'total_clicks': 0, 'active_days': 0, 'unique_users': 0}
     
     async def get_top_performing_links(self, user_id: int, limit: int = 10) -> List[Dict]:
         """Get top performing links for a user"""
-        cursor = await self.connection.execute(
-            """
-            SELECT 
-                al.short_id,
-                al.title,
-                al.category,
-                COUNT(ct.id) as clicks,
-                COUNT(DISTINCT ct.user_id) as unique_users
-            FROM affiliate_links al
-            LEFT JOIN click_tracking ct ON al.id = ct.link_id
-            WHERE al.created_by = ? AND al.is_active = 1
-            GROUP BY al.id
-            ORDER BY clicks DESC
-            LIMIT ?
-            """,
-            (user_id, limit)
-        )
-        
-        rows = await cursor.fetchall()
-        columns = [description[0] for description in cursor.description]
-        return [dict(zip(columns, row)) for row in rows]
+        async with self._acquire_read() as conn:
+            cursor = await conn.execute(
+                """
+                SELECT 
+                    al.short_id,
+                    al.title,
+                    al.category,
+                    COUNT(ct.id) as clicks,
+                    COUNT(DISTINCT ct.user_id) as unique_users
+                FROM affiliate_links al
+                LEFT JOIN click_tracking ct ON al.id = ct.link_id
+                WHERE al.created_by = ? AND al.is_active = 1
+                GROUP BY al.id
+                ORDER BY clicks DESC
+                LIMIT ?
+                """,
+                (user_id, limit)
+            )
+            
+            rows = await cursor.fetchall()
+        return [dict(row) for row in rows]
+    
+    async def get_leaderboard_links(self, limit: int = 10) -> List[Tuple]:
+        """Get (title, category, creator, clicks) of the most clicked active links across all users"""
+        async with self._acquire_read() as conn:
+            cursor = await conn.execute(
+                """
+                SELECT 
+                    al.title,
+                    al.category,
+                    'Anonymous' as creator,
+                    COUNT(ct.id) as clicks
+                FROM affiliate_links al
+                LEFT JOIN click_tracking ct ON al.id = ct.link_id
+                WHERE al.is_active = 1
+                GROUP BY al.id
+                HAVING clicks > 0
+                ORDER BY clicks DESC
+                LIMIT ?
+                """,
+                (limit,)
+            )
+            
+            return await cursor.fetchall()
     
     async def cache_niche_analysis(self, query: str, analysis_data: str, ttl_hours: int = 24):
         """Cache niche analysis results"""
-        expires_at = datetime.now() + timedelta(hours=ttl_hours)
-        await self.connection.execute(
-            """
-            INSERT OR REPLACE INTO niche_analysis_cache 
-            (niche_query, analysis_data, expires_at)
-            VALUES (?, ?, ?)
-            """,
-            (query, analysis_data, expires_at)
-        )
-        await self.connection.commit()
+        # Expiry is computed by SQLite in UTC, like CURRENT_TIMESTAMP it is compared to
+        async with self._write_lock:
+            await self.connection.execute(
+                """
+                INSERT INTO niche_analysis_cache 
+                (niche_query, analysis_data, expires_at)
+                VALUES (?, ?, datetime('now', ?))
+                ON CONFLICT(niche_query) 
+                DO UPDATE SET analysis_data = excluded.analysis_data,
+                              created_at = CURRENT_TIMESTAMP,
+                              expires_at = excluded.expires_at
+                """,
+                (query, analysis_data, f'+{ttl_hours} hours')
+            )
+            await self.connection.commit()
+        
+        self._niche_cache.set(query, analysis_data, ttl_hours * 3600)
     
-    async def get_cached_niche_analysis(self, query: str) -> Optional[str]:
-        """Get cached niche analysis if still valid"""
-        cursor = await self.connection.execute(
-            """
-            SELECT analysis_data FROM niche_analysis_cache 
-            WHERE niche_query = ? AND expires_at > CURRENT_TIMESTAMP
-            """,
-            (query,)
-        )
-        row = await cursor.fetchone()
-        return row[0] if row else None
+    async def get_cached_niche_analysis(self, query: str) -> Tuple[Optional[str], bool]:
+        """Get cached niche analysis and whether it is past its expiry
+        
+        Expired entries are still returned for up to NICHE_MAX_STALE_HOURS so the
+        caller can answer right away and refresh in the background.
+        """
+        analysis_data = self._niche_cache.get(query)
+        if analysis_data is not None:
+            return analysis_data, False
+        
+        async with self._acquire_read() as conn:
+            cursor = await conn.execute(
+                """
+                SELECT analysis_data,
+                       (julianday(expires_at) - julianday(CURRENT_TIMESTAMP)) * 86400 as seconds_left
+                FROM niche_analysis_cache 
+                WHERE niche_query = ? AND expires_at > datetime(CURRENT_TIMESTAMP, ?)
+                """,
+                (query, f'-{NICHE_MAX_STALE_HOURS} hours')
+            )
+            row = await cursor.fetchone()
+        if not row:
+            return None, False
+        
+        analysis_data, seconds_left = row
+        if seconds_left <= 0:
+            return analysis_data, True
+        
+        # Keep it in memory for as long as the stored entry stays valid
+        self._niche_cache.set(query, analysis_data, seconds_left)
+        return analysis_data, False
     
-    async def get_user_links(self, user_id: int) -> List[Dict]:
-        """Get all links created by a user"""
-        cursor = await self.connection.execute(
-            """
-            SELECT 
-                short_id, title, category, created_at,
-                (SELECT COUNT(*) FROM click_tracking WHERE link_id = affiliate_links.id) as clicks
-            FROM affiliate_links 
-            WHERE created_by = ? AND is_active = 1
-            ORDER BY created_at DESC
-            """,
-            (user_id,)
-        )
+    async def get_user_links(self, user_id: int, limit: Optional[int] = None) -> List[Dict]:
+        """Get links created by a user, newest first (all of them unless limit is set)
         
-        rows = await cursor.fetchall()
-        columns = [description[0] for description in cursor.description]
-        return [dict(zip(columns, row)) for row in rows]
+        Click counts are summed from the daily link_performance totals rather than
+        counted from click_tracking.
+        """
+        async with self._acquire_read() as conn:
+            cursor = await conn.execute(
+                """
+                SELECT 
+                    al.short_id, al.title, al.category, al.created_at,
+                    COALESCE(SUM(lp.clicks), 0) as clicks
+                FROM affiliate_links al
+                LEFT JOIN link_performance lp ON al.id = lp.link_id
+                WHERE al.created_by = ? AND al.is_active = 1
+                GROUP BY al.id
+                ORDER BY al.created_at DESC
+                LIMIT ?
+                """,
+                (user_id, -1 if limit is None else limit)
+            )
+            
+            rows = await cursor.fetchall()
+        return [dict(row) for row in rows]
     
     async def close(self):
         """Close database connection"""
+        if self._flusher_task:
+            # Refuse new clicks, then let the flusher write everything queued before the sentinel
+            flusher_task, self._flusher_task = self._flusher_task, None
+            if not flusher_task.done():
+                await self._click_queue.put(None)
+                await flusher_task
+        
+        if self._read_pool:
+            while not self._read_pool.empty():
+                await self._read_pool.get_nowait().close()
+            self._read_pool = None
+        
         if self.connection:
             await self.connection.close()
             logger.info("Database connection closed")
@@ -0,0 +1,47 @@
+"""
+Process-wide HTTP session shared by every outbound API client
+"""
+
+import asyncio
+import logging
+from typing import Optional
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Concurrency budget per upstream host; a slow provider queues on its own
+# limit instead of taking connections from the others
+PROVIDER_PROFILES = {
+    "api.groq.com": {"max_concurrent": 8},
+}
+
+_session: Optional[aiohttp.ClientSession] = None
+
+def get_session() -> aiohttp.ClientSession:
+    """Get the shared HTTP session, creating it on first use so it binds to the running loop"""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=100,
+                limit_per_host=10,
+                ttl_dns_cache=300,
+                keepalive_timeout=75,
+                happy_eyeballs_delay=0.25
+            )
+        )
+    return _session
+
+async def preconnect(url: str, timeout: float = 2.0):
+    """Open a pooled connection to url's host so the first real request skips DNS and TLS setup"""
+    try:
+        async with get_session().head(url, timeout=aiohttp.ClientTimeout(total=timeout)):
+            pass
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.debug(f"Preconnect to {url} failed: {e}")
+
+async def close_session():
+    """Close the shared HTTP session"""
+    if _session and not _session.closed:
+        await _session.close()
+        logger.info("HTTP session closed")
@@ -2,10 +2,13 @@
 Affiliate Service for link management, tracking, and analytics
 """
 
+import aiosqlite
 import asyncio
+import functools
 import hashlib
+import heapq
+import re
 import secrets
-import string
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 from urllib.parse import urlparse, parse_qs
@@ -15,6 +18,21 @@ from bot.core.database import Database
 
 logger = logging.getLogger(__name__)
 
+# Compiled once; Amazon product URLs carry the ASIN after /dp/, /product/ or asin=
+_AMAZON_ASIN_RE = re.compile(r'(?:/dp/|/product/|asin=)([A-Z0-9]{10})')
+
+# Common affiliate indicators, matched case-insensitively in one pass
+_AFFILIATE_INDICATOR_RE = re.compile(
+    r'tag=|ref=|affiliate=|aff=|partner=|clickbank\.net|shareasale\.com|cj\.com|amazon\.|amzn\.to',
+    re.IGNORECASE
+)
+
+# Fresh short IDs tried before giving up on creating a link
+SHORT_ID_ATTEMPTS = 5
+
+# SQLite's message for a duplicate short_id, the only IntegrityError worth retrying
+_SHORT_ID_COLLISION = "UNIQUE constraint failed: affiliate_links.short_id"
+
 class AffiliateService:
     def __init__(self, database: Database):
         self.db = database
@@ -23,31 +41,34 @@ class AffiliateService:
         logger.info("✅ Affiliate service initialized")
     
     def generate_short_id(self, length: int = 8) -> str:
-        """Generate a unique short ID for affiliate links"""
-        chars = string.ascii_letters + string.digits
-        return ''.join(secrets.choice(chars) for _ in range(length))
+        """Generate a random URL-safe short ID for affiliate links"""
+        # Each token byte encodes to 4/3 characters, so this always yields enough
+        return secrets.token_urlsafe(length * 3 // 4 + 1)[:length]
     
     async def create_affiliate_link(self, original_url: str, affiliate_url: str, 
                                   title: str, description: str, category: str, 
                                   created_by: int) -> Tuple[str, int]:
         """Create a new tracked affiliate link"""
-        # Generate unique short ID
-        short_id = self.generate_short_id()
-        
-        # Ensure uniqueness
-        while await self.db.get_affiliate_link(short_id):
+        # Create the link in database; short_id is UNIQUE, so a collision just
+        # means trying again with a fresh ID
+        for attempt in range(1, SHORT_ID_ATTEMPTS + 1):
             short_id = self.generate_short_id()
-        
-        # Create the link in database
-        link_id = await self.db.create_affiliate_link(
-            short_id=short_id,
-            original_url=original_url,
-            affiliate_url=affiliate_url,
-            title=title,
-            description=description,
-            category=category,
-            created_by=created_by
-        )
+            try:
+                link_id = await self.db.create_affiliate_link(
+                    short_id=short_id,
+                    original_url=original_url,
+                    affiliate_url=affiliate_url,
+                    title=title,
+                    description=description,
+                    category=category,
+                    created_by=created_by
+                )
+                break
+            except aiosqlite.IntegrityError as e:
+                # Any other constraint failure would fail the same way on every retry
+                if _SHORT_ID_COLLISION not in str(e) or attempt == SHORT_ID_ATTEMPTS:
+                    raise
+                logger.debug(f"Short ID collision on {short_id}, retrying")
         
         logger.info(f"Created affiliate link: {short_id} for user {created_by}")
         return short_id, link_id
@@ -60,29 +81,48 @@ class AffiliateService:
                          ip_address: Optional[str] = None, user_agent: Optional[str] = None,
                          referrer: Optional[str] = None) -> Tuple[bool, Optional[str]]:
         """Track a click and return success status and redirect URL"""
-        # Get the affiliate link
-        link_data = await self.db.get_affiliate_link(short_id)
+        # Get the link ID and redirect target
+        target = await self.db.get_link_for_redirect(short_id)
         
-        if not link_data:
+        if not target:
             return False, None
         
+        link_id, affiliate_url = target
+        
         # Track the click
         await self.db.track_click(
-            link_id=link_data['id'],
+            link_id=link_id,
             user_id=user_id,
             ip_address=ip_address,
             user_agent=user_agent,
             referrer=referrer
         )
         
-        logger.info(f"Tracked click for link {short_id} from user {user_id}")
-        return True, link_data['affiliate_url']
+        logger.debug(f"Tracked click for link {short_id} from user {user_id}")
+        return True, affiliate_url
+    
+    async def resolve(self, short_id: str) -> Optional[str]:
+        """Get the redirect URL for an active link"""
+        target = await self.db.get_link_for_redirect(short_id)
+        return target[1] if target else None
+    
+    async def log_click(self, short_id: str, ip_address: Optional[str] = None,
+                        user_agent: Optional[str] = None, referrer: Optional[str] = None):
+        """Record a click in the background; the write happens with the next batch"""
+        target = await self.db.get_link_for_redirect(short_id)
+        if target:
+            self.db.queue_click(
+                link_id=target[0],
+                ip_address=ip_address,
+                user_agent=user_agent,
+                referrer=referrer
+            )
     
     async def get_link_analytics(self, short_id: str, user_id: int) -> Optional[Dict]:
         """Get analytics for a specific link"""
-        link_data = await self.db.get_affiliate_link(short_id)
+        link_data = await self.db.get_affiliate_link(short_id, created_by=user_id)
         
-        if not link_data or link_data['created_by'] != user_id:
+        if not link_data:
             return None
         
         # Get click statistics
@@ -91,20 +131,21 @@ class AffiliateService:
         return {
             'link_info': link_data,
             'stats': stats,
-            'tracking_url': self.get_tracking_url(short_id)
+            'tracking_url': self.get_tracking_url(short_id),
+            'affiliate_info': self.extract_affiliate_info(link_data['affiliate_url'])
         }
     
     async def get_user_dashboard(self, user_id: int) -> Dict:
         """Get comprehensive dashboard data for a user"""
-        # Get user's links
+        # Get user's links with click totals (newest first) in a single query
         user_links = await self.db.get_user_links(user_id)
         
-        # Get top performing links
-        top_links = await self.db.get_top_performing_links(user_id, limit=5)
+        # Top performing links come from the same result set
+        top_links = heapq.nlargest(5, user_links, key=lambda link: link['clicks'])
         
         # Calculate totals
         total_links = len(user_links)
-        total_clicks = sum(link.get('clicks', 0) for link in user_links)
+        total_clicks = sum(link['clicks'] for link in user_links)
         
         return {
             'total_links': total_links,
@@ -116,17 +157,24 @@ class AffiliateService:
     
     def extract_affiliate_info(self, url: str) -> Dict:
         """Extract affiliate information from URL"""
+        # Copy so callers never mutate the cached entry
+        return dict(self._extract_affiliate_info_cached(url))
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _extract_affiliate_info_cached(url: str) -> Dict:
+        """Extract affiliate information, memoized by URL since the same links recur"""
         parsed = urlparse(url)
         domain = parsed.netloc.lower()
         
         # Common affiliate patterns
         affiliate_patterns = {
-            'amazon.com': self._extract_amazon_info,
-            'amazon.': self._extract_amazon_info,  # For international domains
-            'clickbank.net': self._extract_clickbank_info,
-            'shareasale.com': self._extract_shareasale_info,
-            'cj.com': self._extract_cj_info,
-            'commission-junction.com': self._extract_cj_info,
+            'amazon.com': AffiliateService._extract_amazon_info,
+            'amazon.': AffiliateService._extract_amazon_info,  # For international domains
+            'clickbank.net': AffiliateService._extract_clickbank_info,
+            'shareasale.com': AffiliateService._extract_shareasale_info,
+            'cj.com': AffiliateService._extract_cj_info,
+            'commission-junction.com': AffiliateService._extract_cj_info,
         }
         
         # Check for known affiliate networks
@@ -135,37 +183,29 @@ class AffiliateService:
                 return extractor(url, parsed)
         
         # Generic affiliate detection
-        return self._extract_generic_info(url, parsed)
+        return AffiliateService._extract_generic_info(url, parsed)
     
-    def _extract_amazon_info(self, url: str, parsed) -> Dict:
+    @staticmethod
+    def _extract_amazon_info(url: str, parsed) -> Dict:
         """Extract Amazon affiliate information"""
         params = parse_qs(parsed.query)
         
         return {
             'network': 'Amazon Associates',
             'affiliate_id': params.get('tag', ['Unknown'])[0],
-            'product_id': self._extract_amazon_asin(url),
+            'product_id': AffiliateService._extract_amazon_asin(url),
             'commission_rate': '1-10%',
             'network_type': 'merchant'
         }
     
-    def _extract_amazon_asin(self, url: str) -> str:
+    @staticmethod
+    def _extract_amazon_asin(url: str) -> str:
         """Extract ASIN from Amazon URL"""
-        import re
-        asin_patterns = [
-            r'/dp/([A-Z0-9]{10})',
-            r'/product/([A-Z0-9]{10})',
-            r'asin=([A-Z0-9]{10})',
-        ]
-        
-        for pattern in asin_patterns:
-            match = re.search(pattern, url)
-            if match:
-                return match.group(1)
-        
-        return 'Unknown'
+        match = _AMAZON_ASIN_RE.search(url)
+        return match.group(1) if match else 'Unknown'
     
-    def _extract_clickbank_info(self, url: str, parsed) -> Dict:
+    @staticmethod
+    def _extract_clickbank_info(url: str, parsed) -> Dict:
         """Extract ClickBank affiliate information"""
         # ClickBank URLs often have affiliate ID in the path
         path_parts = parsed.path.split('/')
@@ -178,7 +218,8 @@ class AffiliateService:
             'network_type': 'digital_products'
         }
     
-    def _extract_shareasale_info(self, url: str, parsed) -> Dict:
+    @staticmethod
+    def _extract_shareasale_info(url: str, parsed) -> Dict:
         """Extract ShareASale affiliate information"""
         params = parse_qs(parsed.query)
         
@@ -190,7 +231,8 @@ class AffiliateService:
             'network_type': 'network'
         }
     
-    def _extract_cj_info(self, url: str, parsed) -> Dict:
+    @staticmethod
+    def _extract_cj_info(url: str, parsed) -> Dict:
         """Extract Commission Junction (CJ) affiliate information"""
         params = parse_qs(parsed.query)
         
@@ -201,7 +243,8 @@ class AffiliateService:
             'network_type': 'network'
         }
     
-    def _extract_generic_info(self, url: str, parsed) -> Dict:
+    @staticmethod
+    def _extract_generic_info(url: str, parsed) -> Dict:
         """Extract generic affiliate information"""
         params = parse_qs(parsed.query)
         
@@ -224,6 +267,12 @@ class AffiliateService:
     
     def validate_affiliate_url(self, url: str) -> Tuple[bool, str]:
         """Validate if URL appears to be an affiliate link"""
+        return self._validate_affiliate_url_cached(url)
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=8192)
+    def _validate_affiliate_url_cached(url: str) -> Tuple[bool, str]:
+        """Validate an affiliate URL, memoized by URL since users re-post the same links"""
         try:
             parsed = urlparse(url)
             
@@ -231,15 +280,8 @@ class AffiliateService:
                 return False, "Invalid URL format"
             
             # Check for common affiliate indicators
-            affiliate_indicators = [
-                'tag=', 'ref=', 'affiliate=', 'aff=', 'partner=',
-                'clickbank.net', 'shareasale.com', 'cj.com',
-                'amazon.', 'amzn.to'
-            ]
-            
-            for indicator in affiliate_indicators:
-                if indicator in url.lower():
-                    return True, "Valid affiliate URL detected"
+            if _AFFILIATE_INDICATOR_RE.search(url):
+                return True, "Valid affiliate URL detected"
             
             return True, "URL accepted (affiliate status unclear)"
             
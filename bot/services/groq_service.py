@@ -4,24 +4,247 @@ Groq AI Service for niche analysis and product recommendations
 
 import asyncio
 import aiohttp
-import json
+import functools
 import logging
+import random
 from typing import Dict, List, Optional
+import orjson
+from bot.core.http import PROVIDER_PROFILES, get_session, preconnect
+from bot.utils.cache import TTLCache, normalize_key
 from bot.utils.config import Config
 
 logger = logging.getLogger(__name__)
 
+# Distinct prompts whose responses are kept for Config.CACHE_TTL
+RESPONSE_CACHE_SIZE = 512
+
+# Retry policy and per-attempt timeout for Groq requests
+MAX_ATTEMPTS = 3
+RETRY_STATUSES = {429, 500, 502, 503}
+MAX_RETRY_AFTER = 20
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=20, connect=5)
+
+# The prompts ask for under 1500 characters (~400 tokens); this bounds generation
+# time for replies that run long instead of paying for 1500 tokens of headroom
+MAX_RESPONSE_TOKENS = 512
+
+# Response bodies larger than this are parsed in a worker thread, off the gateway loop
+THREADED_PARSE_BYTES = 32_768
+
+def _retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """Seconds to wait before the next attempt: the server's hint, else jittered backoff"""
+    if retry_after:
+        try:
+            return min(float(retry_after), MAX_RETRY_AFTER)
+        except ValueError:
+            pass
+    return 2 ** (attempt - 1) + random.random()
+
+def is_error_response(response: Optional[str]) -> bool:
+    """Whether a response is missing or one of the "❌ ..." error strings, which must not be cached"""
+    return not response or response.startswith("❌")
+
+def _cache_responses(method):
+    """Reuse a recent successful response for the same method and (normalized) arguments"""
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        key = (
+            method.__name__,
+            tuple(normalize_key(arg) if isinstance(arg, str) else arg for arg in args),
+            tuple(sorted(kwargs.items()))
+        )
+        response = self._response_cache.get(key)
+        if response is None:
+            response = await method(self, *args, **kwargs)
+            
+            # Errors should be retried, not cached
+            if not is_error_response(response):
+                self._response_cache.set(key, response, Config.CACHE_TTL)
+        return response
+    
+    return wrapper
+
+# Prompts are fixed text with the user's input appended last, so every request
+# of a kind shares the longest possible identical prefix (cheaper to encode and
+# eligible for provider-side prefix caching)
+_NICHE_SYSTEM = "You are an expert affiliate marketing analyst with years of experience in niche research and optimization."
+_NICHE_PROMPT = """As an expert affiliate marketer, analyze the niche named at the end of this message for affiliate marketing opportunities.
+
+Provide a comprehensive analysis including:
+
+📊 **Market Analysis:**
+- Market size and growth potential
+- Target audience demographics
+- Seasonal trends and patterns
+
+💰 **Monetization Opportunities:**
+- High-converting product categories
+- Average commission rates
+- Top affiliate programs/networks
+
+🎯 **Content Strategy:**
+- Best content types for this niche
+- Trending keywords and topics
+- Platform recommendations (Blog, YouTube, Social Media)
+
+⚠️ **Challenges & Competition:**
+- Market saturation level
+- Main competitors
+- Potential obstacles
+
+🚀 **Action Plan:**
+- 3 specific product types to promote
+- Content ideas for immediate implementation
+- Growth strategies
+
+Keep the response detailed but concise, under 1500 characters for Discord.
+
+"""
+
+_PRODUCTS_SYSTEM = "You are a seasoned affiliate marketer specializing in product research and conversion optimization."
+_PRODUCTS_PROMPT = """Recommend specific product types and categories for affiliate marketing in the niche (and budget, if given) named at the end of this message.
+
+Provide:
+
+🎯 **Top 5 Product Recommendations:**
+1. Product type + why it converts well
+2. Expected commission range
+3. Target customer profile
+
+📈 **Trending Products:**
+- What's hot right now in this niche
+- Seasonal opportunities
+- Emerging product categories
+
+💡 **Pro Tips:**
+- Best promotional strategies for each product
+- Platforms where these products perform best
+- Content angles that drive sales
+
+🔍 **Research Keywords:**
+- High-intent buyer keywords
+- Product comparison terms
+- Problem-solving searches
+
+Format for Discord readability, under 1500 characters.
+
+"""
+
+_CONTENT_SYSTEM = "You are a content marketing expert focused on affiliate marketing conversions and SEO optimization."
+_CONTENT_PROMPT = """Create an optimized content strategy for promoting the product in the niche, using the content type, named at the end of this message.
+
+Provide:
+
+📝 **Content Ideas:**
+- 3 high-converting content angles
+- Attention-grabbing headlines/titles
+- Hook strategies for engagement
+
+🔍 **SEO Strategy:**
+- Primary keywords to target
+- Long-tail keyword opportunities
+- Content structure recommendations
+
+🎯 **Conversion Tactics:**
+- Where to place affiliate links naturally
+- Call-to-action examples
+- Trust-building elements
+
+📊 **Performance Tracking:**
+- Metrics to monitor
+- A/B testing suggestions
+- Optimization opportunities
+
+Keep practical and actionable, under 1500 characters.
+
+"""
+
+_COMPETITION_SYSTEM = "You are a competitive intelligence analyst specializing in affiliate marketing and digital business strategy."
+_COMPETITION_PROMPT = """Analyze the competition landscape for the affiliate marketing niche named at the end of this message.
+
+Provide:
+
+🏁 **Competitive Landscape:**
+- Market saturation level (Low/Medium/High)
+- Main types of competitors
+- Barrier to entry assessment
+
+💪 **Competitive Advantages:**
+- Gaps in the market you can exploit
+- Underserved customer segments
+- Content opportunities competitors miss
+
+📊 **Benchmark Analysis:**
+- Average content quality standards
+- Common promotional strategies
+- Pricing and commission comparisons
+
+🚀 **Differentiation Strategy:**
+- How to stand out from competitors
+- Unique value propositions to consider
+- Blue ocean opportunities
+
+⚡ **Quick Wins:**
+- Immediate opportunities to capture
+- Low-hanging fruit in this niche
+
+Format for Discord, under 1500 characters.
+
+"""
+
+_TRENDS_SYSTEM = "You are a trend analyst and affiliate marketing strategist with expertise in identifying profitable opportunities."
+_TRENDS_PROMPT = """Identify current trending topics and emerging opportunities for affiliate marketing in the niche named at the end of this message.
+
+📈 **Current Trends:**
+- What's trending now in this niche
+- Social media buzz topics
+- Search volume spikes
+
+🔮 **Emerging Opportunities:**
+- New product categories gaining traction
+- Underexplored sub-niches
+- Technology disruptions creating opportunities
+
+📅 **Seasonal Patterns:**
+- Best times of year for this niche
+- Holiday/event-driven opportunities
+- Cyclical buying patterns
+
+💎 **Hidden Gems:**
+- Lesser-known but profitable angles
+- Micro-niches with high potential
+- Cross-over opportunities from related niches
+
+🎯 **Action Items:**
+- Top 3 trends to capitalize on immediately
+- Content ideas for each trend
+
+Keep concise for Discord, under 1500 characters.
+
+"""
+
 class GroqService:
     def __init__(self):
         self.api_key = Config.GROQ_API_KEY
         self.model = Config.GROQ_MODEL
         self.base_url = "https://api.groq.com/openai/v1/chat/completions"
         
+        # Recent responses of the analysis methods, keyed by method and arguments
+        self._response_cache = TTLCache(RESPONSE_CACHE_SIZE)
+        
+        # Caps in-flight Groq calls so bursts queue here instead of hitting rate limits
+        self._semaphore = asyncio.Semaphore(PROVIDER_PROFILES["api.groq.com"]["max_concurrent"])
+        
         if not self.api_key:
             logger.error("Groq API key not found!")
             
         logger.info(f"✅ Groq service initialized with model: {self.model}")
     
+    async def warm_up(self):
+        """Pre-open a connection to Groq so the first command doesn't pay the TLS handshake"""
+        if self.api_key:
+            await preconnect(self.base_url)
+    
     async def _make_request(self, messages: List[Dict], max_tokens: int = 2000) -> Optional[str]:
         """Make a request to Groq API"""
         if not self.api_key:
@@ -40,216 +263,97 @@ class GroqService:
             "top_p": 0.9
         }
         
+        # Encoded once, outside the retry loop
+        body = orjson.dumps(payload)
+        
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(self.base_url, headers=headers, json=payload) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data['choices'][0]['message']['content'].strip()
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"Groq API error {response.status}: {error_text}")
-                        return f"❌ API Error: {response.status}"
+            session = get_session()
+            async with self._semaphore:
+                for attempt in range(1, MAX_ATTEMPTS + 1):
+                    try:
+                        async with session.post(self.base_url, headers=headers, data=body,
+                                                timeout=REQUEST_TIMEOUT) as response:
+                            if response.status == 200:
+                                raw = await response.read()
+                                if len(raw) > THREADED_PARSE_BYTES:
+                                    data = await asyncio.to_thread(orjson.loads, raw)
+                                else:
+                                    data = orjson.loads(raw)
+                                if attempt > 1:
+                                    logger.info(f"Groq request succeeded on attempt {attempt}")
+                                return data['choices'][0]['message']['content'].strip()
+                            
+                            error_text = await response.text()
+                            if response.status not in RETRY_STATUSES or attempt == MAX_ATTEMPTS:
+                                logger.error(f"Groq API error {response.status} after {attempt} attempt(s): {error_text}")
+                                return f"❌ API Error: {response.status}"
+                            
+                            delay = _retry_delay(attempt, response.headers.get('Retry-After'))
+                            logger.warning(f"Groq API error {response.status}, retrying in {delay:.1f}s")
+                    except asyncio.TimeoutError:
+                        if attempt == MAX_ATTEMPTS:
+                            raise
+                        delay = _retry_delay(attempt)
+                        logger.warning(f"Groq request timed out, retrying in {delay:.1f}s")
+                    
+                    await asyncio.sleep(delay)
         except Exception as e:
             logger.error(f"Error calling Groq API: {e}")
             return f"❌ Network Error: {str(e)}"
     
+    @_cache_responses
     async def analyze_niche(self, niche: str) -> str:
         """Analyze a niche for affiliate marketing opportunities"""
-        prompt = f"""
-        As an expert affiliate marketer, analyze the "{niche}" niche for affiliate marketing opportunities.
-        
-        Provide a comprehensive analysis including:
-        
-        📊 **Market Analysis:**
-        - Market size and growth potential
-        - Target audience demographics
-        - Seasonal trends and patterns
-        
-        💰 **Monetization Opportunities:**
-        - High-converting product categories
-        - Average commission rates
-        - Top affiliate programs/networks
-        
-        🎯 **Content Strategy:**
-        - Best content types for this niche
-        - Trending keywords and topics
-        - Platform recommendations (Blog, YouTube, Social Media)
-        
-        ⚠️ **Challenges & Competition:**
-        - Market saturation level
-        - Main competitors
-        - Potential obstacles
-        
-        🚀 **Action Plan:**
-        - 3 specific product types to promote
-        - Content ideas for immediate implementation
-        - Growth strategies
-        
-        Keep the response detailed but concise, under 1500 characters for Discord.
-        """
-        
         messages = [
-            {"role": "system", "content": "You are an expert affiliate marketing analyst with years of experience in niche research and optimization."},
-            {"role": "user", "content": prompt}
+            {"role": "system", "content": _NICHE_SYSTEM},
+            {"role": "user", "content": f'{_NICHE_PROMPT}Niche: "{niche}"'}
         ]
         
-        return await self._make_request(messages, max_tokens=1500)
+        return await self._make_request(messages, max_tokens=MAX_RESPONSE_TOKENS)
     
+    @_cache_responses
     async def recommend_products(self, niche: str, budget: Optional[str] = None) -> str:
         """Recommend specific products for affiliate promotion"""
-        budget_text = f" with a budget of {budget}" if budget else ""
-        
-        prompt = f"""
-        Recommend specific product types and categories for affiliate marketing in the "{niche}" niche{budget_text}.
-        
-        Provide:
-        
-        🎯 **Top 5 Product Recommendations:**
-        1. Product type + why it converts well
-        2. Expected commission range
-        3. Target customer profile
-        
-        📈 **Trending Products:**
-        - What's hot right now in this niche
-        - Seasonal opportunities
-        - Emerging product categories
-        
-        💡 **Pro Tips:**
-        - Best promotional strategies for each product
-        - Platforms where these products perform best
-        - Content angles that drive sales
-        
-        🔍 **Research Keywords:**
-        - High-intent buyer keywords
-        - Product comparison terms
-        - Problem-solving searches
-        
-        Format for Discord readability, under 1500 characters.
-        """
+        budget_text = f"\nBudget: {budget}" if budget else ""
         
         messages = [
-            {"role": "system", "content": "You are a seasoned affiliate marketer specializing in product research and conversion optimization."},
-            {"role": "user", "content": prompt}
+            {"role": "system", "content": _PRODUCTS_SYSTEM},
+            {"role": "user", "content": f'{_PRODUCTS_PROMPT}Niche: "{niche}"{budget_text}'}
         ]
         
-        return await self._make_request(messages, max_tokens=1500)
+        return await self._make_request(messages, max_tokens=MAX_RESPONSE_TOKENS)
     
+    @_cache_responses
     async def optimize_content(self, content_type: str, niche: str, product: str) -> str:
         """Generate optimized content ideas for affiliate marketing"""
-        prompt = f"""
-        Create optimized {content_type} content strategy for promoting "{product}" in the "{niche}" niche.
-        
-        Provide:
-        
-        📝 **Content Ideas:**
-        - 3 high-converting content angles
-        - Attention-grabbing headlines/titles
-        - Hook strategies for engagement
-        
-        🔍 **SEO Strategy:**
-        - Primary keywords to target
-        - Long-tail keyword opportunities
-        - Content structure recommendations
-        
-        🎯 **Conversion Tactics:**
-        - Where to place affiliate links naturally
-        - Call-to-action examples
-        - Trust-building elements
-        
-        📊 **Performance Tracking:**
-        - Metrics to monitor
-        - A/B testing suggestions
-        - Optimization opportunities
-        
-        Keep practical and actionable, under 1500 characters.
-        """
-        
         messages = [
-            {"role": "system", "content": "You are a content marketing expert focused on affiliate marketing conversions and SEO optimization."},
-            {"role": "user", "content": prompt}
+            {"role": "system", "content": _CONTENT_SYSTEM},
+            {"role": "user", "content": (
+                f'{_CONTENT_PROMPT}Content type: {content_type}\n'
+                f'Product: "{product}"\nNiche: "{niche}"'
+            )}
         ]
         
-        return await self._make_request(messages, max_tokens=1500)
+        return await self._make_request(messages, max_tokens=MAX_RESPONSE_TOKENS)
     
+    @_cache_responses
     async def analyze_competition(self, niche: str, competitor_url: Optional[str] = None) -> str:
         """Analyze competition in a niche"""
-        competitor_text = f" Also analyze this competitor: {competitor_url}" if competitor_url else ""
-        
-        prompt = f"""
-        Analyze the competition landscape for the "{niche}" affiliate marketing niche.{competitor_text}
-        
-        Provide:
-        
-        🏁 **Competitive Landscape:**
-        - Market saturation level (Low/Medium/High)
-        - Main types of competitors
-        - Barrier to entry assessment
-        
-        💪 **Competitive Advantages:**
-        - Gaps in the market you can exploit
-        - Underserved customer segments
-        - Content opportunities competitors miss
-        
-        📊 **Benchmark Analysis:**
-        - Average content quality standards
-        - Common promotional strategies
-        - Pricing and commission comparisons
-        
-        🚀 **Differentiation Strategy:**
-        - How to stand out from competitors
-        - Unique value propositions to consider
-        - Blue ocean opportunities
-        
-        ⚡ **Quick Wins:**
-        - Immediate opportunities to capture
-        - Low-hanging fruit in this niche
-        
-        Format for Discord, under 1500 characters.
-        """
+        competitor_text = f"\nAlso analyze this competitor: {competitor_url}" if competitor_url else ""
         
         messages = [
-            {"role": "system", "content": "You are a competitive intelligence analyst specializing in affiliate marketing and digital business strategy."},
-            {"role": "user", "content": prompt}
+            {"role": "system", "content": _COMPETITION_SYSTEM},
+            {"role": "user", "content": f'{_COMPETITION_PROMPT}Niche: "{niche}"{competitor_text}'}
         ]
         
-        return await self._make_request(messages, max_tokens=1500)
+        return await self._make_request(messages, max_tokens=MAX_RESPONSE_TOKENS)
     
+    @_cache_responses
     async def get_trending_topics(self, niche: str) -> str:
         """Get trending topics and opportunities in a niche"""
-        prompt = f"""
-        Identify current trending topics and emerging opportunities in the "{niche}" niche for affiliate marketing.
-        
-        📈 **Current Trends:**
-        - What's trending now in this niche
-        - Social media buzz topics
-        - Search volume spikes
-        
-        🔮 **Emerging Opportunities:**
-        - New product categories gaining traction
-        - Underexplored sub-niches
-        - Technology disruptions creating opportunities
-        
-        📅 **Seasonal Patterns:**
-        - Best times of year for this niche
-        - Holiday/event-driven opportunities
-        - Cyclical buying patterns
-        
-        💎 **Hidden Gems:**
-        - Lesser-known but profitable angles
-        - Micro-niches with high potential
-        - Cross-over opportunities from related niches
-        
-        🎯 **Action Items:**
-        - Top 3 trends to capitalize on immediately
-        - Content ideas for each trend
-        
-        Keep concise for Discord, under 1500 characters.
-        """
-        
         messages = [
-            {"role": "system", "content": "You are a trend analyst and affiliate marketing strategist with expertise in identifying profitable opportunities."},
-            {"role": "user", "content": prompt}
+            {"role": "system", "content": _TRENDS_SYSTEM},
+            {"role": "user", "content": f'{_TRENDS_PROMPT}Niche: "{niche}"'}
         ]
         
-        return await self._make_request(messages, max_tokens=1500)
+        return await self._make_request(messages, max_tokens=MAX_RESPONSE_TOKENS)
@@ -0,0 +1,40 @@
+"""
+In-memory caching helpers shared by the database and services
+"""
+
+import time
+from collections import OrderedDict
+from typing import Optional
+
+def normalize_key(text: Optional[str]) -> Optional[str]:
+    """Normalize user input for cache keys: lowercase with collapsed whitespace"""
+    return " ".join(text.lower().split()) if text else text
+
+class TTLCache:
+    """Small LRU cache whose entries expire after a per-entry lifetime"""
+    
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+    
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        expires, value = entry
+        if expires <= time.monotonic():
+            del self._entries[key]
+            return None
+        
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key, value, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def pop(self, key):
+        self._entries.pop(key, None)
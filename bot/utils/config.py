@@ -5,6 +5,11 @@ Configuration settings for the Discord bot
 import os
 from typing import Optional
 
+from dotenv import load_dotenv
+
+# Config is read once at import, so .env has to be loaded before the class body runs
+load_dotenv()
+
 class Config:
     """Bot configuration settings"""
     
@@ -30,18 +35,20 @@ class Config:
     # Click tracking
     CLICK_NOTIFICATION_CHANNEL = os.getenv('CLICK_NOTIFICATION_CHANNEL')
     
+    # Required variables that are unset, computed once at import
+    _MISSING = tuple(
+        name for name, value in (
+            ('DISCORD_BOT_TOKEN', DISCORD_TOKEN),
+            ('GROQ_API_KEY', GROQ_API_KEY),
+        ) if not value
+    )
+    
     @classmethod
     def validate(cls) -> bool:
         """Validate required configuration"""
-        required = [cls.DISCORD_TOKEN, cls.GROQ_API_KEY]
-        return all(required)
+        return not cls._MISSING
     
     @classmethod
     def get_missing_vars(cls) -> list:
         """Get list of missing required environment variables"""
-        missing = []
-        if not cls.DISCORD_TOKEN:
-            missing.append('DISCORD_BOT_TOKEN')
-        if not cls.GROQ_API_KEY:
-            missing.append('GROQ_API_KEY')
-        return missing
+        return list(cls._MISSING)
@@ -5,7 +5,7 @@ Handles affiliate link redirects and click tracking
 """
 
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import RedirectResponse
+from fastapi.responses import ORJSONResponse, RedirectResponse
 import asyncio
 import logging
 from contextlib import asynccontextmanager
@@ -45,7 +45,8 @@ app = FastAPI(
     title="Affiliate Click Tracker",
     description="Tracks clicks on affiliate links and redirects users",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 @app.get("/")
@@ -82,20 +83,19 @@ async def track_click(short_id: str, request: Request):
         else:
             client_ip = request.client.host if request.client else "Unknown"
         
-        # Track the click
-        success, redirect_url = await affiliate_service.track_click(
+        redirect_url = await affiliate_service.resolve(short_id)
+        if not redirect_url:
+            logger.warning(f"Click tracking failed for {short_id} from {client_ip}")
+            raise HTTPException(status_code=404, detail="Link not found")
+        
+        # Queue the click; it is written with the next batch after we redirect
+        await affiliate_service.log_click(
             short_id=short_id,
-            user_id=None,  # Web clicks don't have Discord user ID
             ip_address=client_ip,
             user_agent=user_agent,
             referrer=referrer
         )
-        
-        if not success:
-            logger.warning(f"Click tracking failed for {short_id} from {client_ip}")
-            raise HTTPException(status_code=404, detail="Link not found")
-        
-        logger.info(f"Tracked click: {short_id} from {client_ip}")
+        logger.debug(f"Tracked click: {short_id} from {client_ip}")
         
         # Redirect to affiliate URL
         return RedirectResponse(url=redirect_url, status_code=302)
@@ -138,6 +138,8 @@ if __name__ == "__main__":
         "click_server:app",
         host="0.0.0.0",
         port=8001,
-        reload=True,
-        log_level="info"
+        reload=False,
+        loop="uvloop",
+        http="httptools",
+        log_level="warning"
     )
@@ -7,9 +7,13 @@ A Python implementation of Call of Duty Zombies mechanics
 import pygame
 import sys
 import math
+import logging
 from game.game_engine import GameEngine
 from game.settings import SCREEN_WIDTH, SCREEN_HEIGHT, FPS
 
+# Gameplay events log at DEBUG/INFO; keep them off the frame loop unless debugging
+logging.basicConfig(level=logging.WARNING)
+
 def main():
     """Main entry point for the COD Zombies game"""
     import os
@@ -41,13 +45,13 @@ def main():
     pygame.mouse.set_visible(False)
     pygame.event.set_grab(True)
     
-    # Create game engine
-    game_engine = GameEngine(screen)
-    
     # Main game loop
     clock = pygame.time.Clock()
     running = True
     
+    # Create game engine
+    game_engine = GameEngine(screen, clock)
+    
     print("🎮 COD Zombies Game Starting...")
     print("Controls:")
     print("  WASD - Move")
@@ -56,24 +60,31 @@ def main():
     print("  ESC - Exit")
     print("-" * 40)
     
+    def stop(event):
+        nonlocal running
+        running = False
+    
+    def on_key_down(event):
+        if event.key == pygame.K_ESCAPE:
+            stop(event)
+    
+    # Event type -> handler; every other event type is blocked at the SDL level
+    handlers = {
+        pygame.QUIT: stop,
+        pygame.KEYDOWN: on_key_down,
+        pygame.MOUSEBUTTONDOWN: lambda event: game_engine.handle_mouse_click(event.button),
+    }
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed(list(handlers))
+    
     while running:
         dt = clock.tick(FPS) / 1000.0  # Delta time in seconds
         
         # Handle events
         for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    running = False
-                else:
-                    game_engine.handle_key_down(event.key)
-            elif event.type == pygame.KEYUP:
-                game_engine.handle_key_up(event.key)
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                game_engine.handle_mouse_click(event.button)
-            elif event.type == pygame.MOUSEMOTION:
-                game_engine.handle_mouse_motion(event.rel)
+            handler = handlers.get(event.type)
+            if handler:
+                handler(event)
         
         # Update game
         game_engine.update(dt)
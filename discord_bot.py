@@ -8,19 +8,15 @@ import discord
 from discord.ext import commands
 import asyncio
 import logging
-import os
-from dotenv import load_dotenv
 
 # Import bot modules
+from bot.core import http
 from bot.core.bot_client import AffiliateBot
 from bot.core.database import Database
 from bot.services.groq_service import GroqService
 from bot.services.affiliate_service import AffiliateService
 from bot.utils.config import Config
 
-# Load environment variables
-load_dotenv()
-
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -32,8 +28,7 @@ async def main():
     """Main entry point for the Discord bot"""
     
     # Check for required environment variables
-    required_vars = ['DISCORD_BOT_TOKEN', 'GROQ_API_KEY']
-    missing_vars = [var for var in required_vars if not os.getenv(var)]
+    missing_vars = Config.get_missing_vars()
     
     if missing_vars:
         logger.error(f"Missing required environment variables: {', '.join(missing_vars)}")
@@ -60,7 +55,7 @@ async def main():
         intents.members = True
         
         bot = AffiliateBot(
-            command_prefix='!',
+            command_prefix=Config.COMMAND_PREFIX,
             intents=intents,
             database=db,
             groq_service=groq_service,
@@ -69,13 +64,14 @@ async def main():
         
         # Start the bot
         logger.info("🤖 Starting Discord Affiliate Marketing Bot...")
-        await bot.start(os.getenv('DISCORD_BOT_TOKEN'))
+        await bot.start(Config.DISCORD_TOKEN)
         
     except discord.LoginFailure:
         logger.error("Invalid Discord bot token")
     except Exception as e:
         logger.error(f"Error starting bot: {e}")
     finally:
+        await http.close_session()
         if 'db' in locals():
             await db.close()
 
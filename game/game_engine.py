@@ -2,6 +2,7 @@
 Main Game Engine - Handles game states, input, and core game loop
 """
 
+import logging
 import pygame
 import math
 from game.settings import *
@@ -10,9 +11,25 @@ from game.world import World
 from game.renderer import Renderer
 from game.hud import HUD
 
+logger = logging.getLogger(__name__)
+
+INV_SQRT2 = 0.7071067811865475
+
+def _move_scales(mask):
+    """(forward, strafe) scales for a W=1/S=2/A=4/D=8 key mask, unit length on diagonals"""
+    forward = bool(mask & 1) - bool(mask & 2)
+    strafe = bool(mask & 8) - bool(mask & 4)
+    if forward and strafe:
+        return forward * INV_SQRT2, strafe * INV_SQRT2
+    return float(forward), float(strafe)
+
+# Movement scales for every combination of held movement keys
+_MOVE_TABLE = tuple(_move_scales(mask) for mask in range(16))
+
 class GameEngine:
-    def __init__(self, screen):
+    def __init__(self, screen, clock=None):
         self.screen = screen
+        self.clock = clock  # Main loop clock, read for the FPS readout
         self.game_state = GAME_STATE_PLAYING  # Start directly in game for now
         
         # Initialize game components
@@ -21,32 +38,18 @@ class GameEngine:
         self.renderer = Renderer(screen, self.world)
         self.hud = HUD(screen)
         
-        # Input handling
-        self.keys_pressed = set()
+        # Debug overlay font and last rendered (text, surface) per line
+        self._debug_font = pygame.font.Font(None, 24)
+        self._debug_lines = {}
         
-        print("✅ Game Engine initialized")
-        print(f"   Player starting at: ({PLAYER_START_X}, {PLAYER_START_Y})")
-    
-    def handle_key_down(self, key):
-        """Handle key press events"""
-        self.keys_pressed.add(key)
-    
-    def handle_key_up(self, key):
-        """Handle key release events"""
-        self.keys_pressed.discard(key)
+        logger.debug("✅ Game Engine initialized")
+        logger.debug("   Player starting at: (%s, %s)", PLAYER_START_X, PLAYER_START_Y)
     
     def handle_mouse_click(self, button):
         """Handle mouse click events"""
         if button == 1:  # Left click
             self.player.shoot()
     
-    def handle_mouse_motion(self, rel):
-        """Handle mouse movement for camera rotation"""
-        if self.game_state == GAME_STATE_PLAYING:
-            # Rotate player based on mouse movement
-            dx, dy = rel
-            self.player.rotate(dx * MOUSE_SENSITIVITY)
-    
     def update(self, dt):
         """Update game logic"""
         if self.game_state == GAME_STATE_PLAYING:
@@ -54,27 +57,25 @@ class GameEngine:
     
     def _update_playing(self, dt):
         """Update game when in playing state"""
-        # Handle movement input
-        move_x, move_y = 0, 0
+        # Rotate player based on mouse movement; SDL sums the motion since the
+        # last call, so this is one rotate per frame however many events arrived
+        dx, dy = pygame.mouse.get_rel()
+        if dx:
+            self.player.rotate(dx * MOUSE_SENSITIVITY)
+        
+        # Handle movement input (SDL keeps the held-key state for us)
+        keys = pygame.key.get_pressed()
+        mask = (keys[pygame.K_w] | keys[pygame.K_s] << 1 |
+                keys[pygame.K_a] << 2 | keys[pygame.K_d] << 3)
         
-        if pygame.K_w in self.keys_pressed:
-            move_x += math.cos(self.player.angle)
-            move_y += math.sin(self.player.angle)
-        if pygame.K_s in self.keys_pressed:
-            move_x -= math.cos(self.player.angle)
-            move_y -= math.sin(self.player.angle)
-        if pygame.K_a in self.keys_pressed:
-            move_x += math.cos(self.player.angle - math.pi/2)
-            move_y += math.sin(self.player.angle - math.pi/2)
-        if pygame.K_d in self.keys_pressed:
-            move_x += math.cos(self.player.angle + math.pi/2)
-            move_y += math.sin(self.player.angle + math.pi/2)
+        # Already normalized, so diagonals are no faster than straight movement
+        forward, strafe = _MOVE_TABLE[mask]
         
-        # Normalize movement
-        if move_x != 0 or move_y != 0:
-            length = math.sqrt(move_x * move_x + move_y * move_y)
-            move_x /= length
-            move_y /= length
+        # Facing direction; strafing uses its perpendicular (-sin, cos)
+        cos_a = math.cos(self.player.angle)
+        sin_a = math.sin(self.player.angle)
+        move_x = forward * cos_a - strafe * sin_a
+        move_y = forward * sin_a + strafe * cos_a
         
         # Update player
         self.player.update(dt, move_x, move_y, self.world)
@@ -103,13 +104,17 @@ class GameEngine:
     
     def _render_debug_info(self):
         """Render debug information"""
-        font = pygame.font.Font(None, 24)
+        fps = self.clock.get_fps() if self.clock else 0.0
         debug_texts = [
             f"Player Pos: ({self.player.x:.1f}, {self.player.y:.1f})",
             f"Player Angle: {math.degrees(self.player.angle):.1f}°",
-            f"FPS: {pygame.time.Clock().get_fps():.1f}",
+            f"FPS: {fps:.1f}",
         ]
         
         for i, text in enumerate(debug_texts):
-            surface = font.render(text, True, WHITE)
-            self.screen.blit(surface, (10, 10 + i * 25))
+            # Only re-render a line when its text changed
+            cached = self._debug_lines.get(i)
+            if cached is None or cached[0] != text:
+                cached = (text, self._debug_font.render(text, True, WHITE))
+                self._debug_lines[i] = cached
+            self.screen.blit(cached[1], (10, 10 + i * 25))
@@ -2,9 +2,12 @@
 HUD class - Handles the heads-up display (UI elements)
 """
 
+import logging
 import pygame
 from game.settings import *
 
+logger = logging.getLogger(__name__)
+
 class HUD:
     def __init__(self, screen):
         self.screen = screen
@@ -12,7 +15,38 @@ class HUD:
         self.font_medium = pygame.font.Font(None, 36)
         self.font_small = pygame.font.Font(None, 24)
         
-        print("✅ HUD initialized")
+        # Last rendered (text, surface) per HUD element; most values rarely change
+        self._text_cache = {}
+        
+        # One pre-drawn health bar per health value, stacked vertically
+        self._health_atlas = self._build_health_atlas()
+        
+        logger.debug("✅ HUD initialized")
+    
+    def _text(self, key, font, text, color):
+        """Get the rendered surface for an element, re-rendering only when its text changed"""
+        cached = self._text_cache.get(key)
+        if cached is None or cached[0] != text:
+            cached = (text, font.render(text, True, color))
+            self._text_cache[key] = cached
+        return cached[1]
+    
+    def _build_health_atlas(self):
+        """Draw the health bar for every value 0..PLAYER_MAX_HEALTH into one surface"""
+        atlas = pygame.Surface((200, (PLAYER_MAX_HEALTH + 1) * 20), 0, self.screen)
+        atlas.fill(DARK_GRAY)
+        for health in range(1, PLAYER_MAX_HEALTH + 1):
+            # Color changes based on health level
+            if health > 70:
+                health_color = GREEN
+            elif health > 30:
+                health_color = YELLOW
+            else:
+                health_color = RED
+            health_width = int((health / PLAYER_MAX_HEALTH) * 198)
+            if health_width > 0:
+                pygame.draw.rect(atlas, health_color, (1, health * 20 + 1, health_width, 18))
+        return atlas
     
     def render(self, player, world):
         """Render all HUD elements"""
@@ -24,61 +58,48 @@ class HUD:
     
     def _render_health(self, player):
         """Render player health bar"""
-        # Health bar background
-        health_bg_rect = pygame.Rect(20, SCREEN_HEIGHT - 100, 200, 20)
-        pygame.draw.rect(self.screen, DARK_GRAY, health_bg_rect)
-        
-        # Health bar fill
-        health_width = int((player.health / player.max_health) * 198)
-        if health_width > 0:
-            health_fill_rect = pygame.Rect(21, SCREEN_HEIGHT - 99, health_width, 18)
-            # Color changes based on health level
-            if player.health > 70:
-                health_color = GREEN
-            elif player.health > 30:
-                health_color = YELLOW
-            else:
-                health_color = RED
-            pygame.draw.rect(self.screen, health_color, health_fill_rect)
+        # Health bar, copied from its pre-drawn row in the atlas
+        health = max(0, min(int(player.health), PLAYER_MAX_HEALTH))
+        self.screen.blit(self._health_atlas, (20, SCREEN_HEIGHT - 100), (0, health * 20, 200, 20))
         
         # Health text
-        health_text = self.font_small.render(f"Health: {player.health}/{player.max_health}", True, WHITE)
+        health_text = self._text('health', self.font_small, f"Health: {player.health}/{player.max_health}", WHITE)
         self.screen.blit(health_text, (20, SCREEN_HEIGHT - 75))
     
     def _render_ammo(self, player):
         """Render ammo counter"""
-        ammo_text = self.font_large.render(f"{player.ammo}", True, WHITE)
+        ammo_text = self._text('ammo', self.font_large, f"{player.ammo}", WHITE)
         text_rect = ammo_text.get_rect()
         text_rect.bottomright = (SCREEN_WIDTH - 20, SCREEN_HEIGHT - 20)
         self.screen.blit(ammo_text, text_rect)
         
         # Ammo type
-        ammo_type_text = self.font_small.render(f"/{player.max_ammo}", True, GRAY)
+        ammo_type_text = self._text('max_ammo', self.font_small, f"/{player.max_ammo}", GRAY)
         type_rect = ammo_type_text.get_rect()
         type_rect.topleft = (text_rect.right, text_rect.bottom - 25)
         self.screen.blit(ammo_type_text, type_rect)
     
     def _render_points(self, player):
         """Render points counter"""
-        points_text = self.font_medium.render(f"Points: {player.points}", True, YELLOW)
+        points_text = self._text('points', self.font_medium, f"Points: {player.points}", YELLOW)
         self.screen.blit(points_text, (20, 20))
     
     def _render_wave_info(self, world):
         """Render current wave information"""
-        wave_text = self.font_medium.render(f"Wave: {world.wave}", True, WHITE)
+        wave_text = self._text('wave', self.font_medium, f"Wave: {world.wave}", WHITE)
         text_rect = wave_text.get_rect()
         text_rect.topright = (SCREEN_WIDTH - 20, 20)
         self.screen.blit(wave_text, text_rect)
         
         # Zombies remaining
-        zombies_text = self.font_small.render(f"Zombies: {len(world.zombies)}", True, RED)
+        zombies_text = self._text('zombies', self.font_small, f"Zombies: {len(world.zombies)}", RED)
         zombie_rect = zombies_text.get_rect()
         zombie_rect.topright = (SCREEN_WIDTH - 20, 55)
         self.screen.blit(zombies_text, zombie_rect)
     
     def _render_weapon_info(self, player):
         """Render current weapon information"""
-        weapon_text = self.font_medium.render(player.current_weapon, True, WHITE)
+        weapon_text = self._text('weapon', self.font_medium, player.current_weapon, WHITE)
         text_rect = weapon_text.get_rect()
         text_rect.bottomright = (SCREEN_WIDTH - 20, SCREEN_HEIGHT - 80)
         self.screen.blit(weapon_text, text_rect)
@@ -2,10 +2,25 @@
 Player class - Handles player movement, rotation, health, and weapons
 """
 
+import logging
 import math
+import numpy as np
 from game.settings import *
 
+logger = logging.getLogger(__name__)
+
+TWO_PI = 2.0 * math.pi
+
+# Gap kept between the player's edge and a wall it stopped against, so the
+# edge stays in the open cell
+WALL_CLEARANCE = 1e-6
+
 class Player:
+    __slots__ = (
+        'x', 'y', 'angle', 'health', 'max_health', 'points',
+        'current_weapon', 'ammo', 'max_ammo', 'speed',
+    )
+    
     def __init__(self, x, y):
         self.x = x
         self.y = y
@@ -24,60 +39,114 @@ class Player:
         # Movement
         self.speed = PLAYER_SPEED
         
-        print(f"✅ Player created at ({x}, {y})")
+        logger.debug("✅ Player created at (%s, %s)", x, y)
     
     def update(self, dt, move_x, move_y, world):
         """Update player position and state"""
         if move_x != 0 or move_y != 0:
-            # Calculate new position
-            new_x = self.x + move_x * self.speed * dt * TILE_SIZE
-            new_y = self.y + move_y * self.speed * dt * TILE_SIZE
+            step = self.speed * dt * TILE_SIZE
             
-            # Check collision with walls
-            if not world.is_wall(new_x, self.y):
-                self.x = new_x
-            if not world.is_wall(self.x, new_y):
-                self.y = new_y
+            # Check collision with walls at the leading edge of the player's body
+            # on each axis, so the camera can't end up inside a wall; a blocked
+            # move stops flush against the wall rather than a step short of it.
+            # Only the axes actually moving are computed or probed
+            if move_x != 0:
+                new_x = self.x + move_x * step
+                edge_x = new_x + (PLAYER_RADIUS if move_x > 0 else -PLAYER_RADIUS)
+                if not world.is_wall(edge_x, self.y):
+                    self.x = new_x
+                else:
+                    self.x = self._stop_at_wall(self.x, edge_x, move_x)
+            if move_y != 0:
+                new_y = self.y + move_y * step
+                edge_y = new_y + (PLAYER_RADIUS if move_y > 0 else -PLAYER_RADIUS)
+                if not world.is_wall(self.x, edge_y):
+                    self.y = new_y
+                else:
+                    self.y = self._stop_at_wall(self.y, edge_y, move_y)
+    
+    @staticmethod
+    def _stop_at_wall(position, edge, direction):
+        """Position on one axis that puts the leading edge against the wall cell containing edge"""
+        cell = math.floor(edge) >> TILE_SHIFT
+        if direction > 0:
+            stop = (cell << TILE_SHIFT) - PLAYER_RADIUS - WALL_CLEARANCE
+            return max(position, stop)
+        stop = ((cell + 1) << TILE_SHIFT) + PLAYER_RADIUS
+        return min(position, stop)
+    
+    def update_batch(self, dt, move_x, move_y, world, n_steps):
+        """Apply update() n_steps times, testing all steps' collisions at once
+        
+        Movement along one axis stops at its first blocked step, as it would
+        across repeated update() calls. Diagonal moves, where each axis's
+        collision depends on the other's progress, fall back to those calls.
+        """
+        if move_x != 0 and move_y != 0:
+            for _ in range(n_steps):
+                self.update(dt, move_x, move_y, world)
+            return
+        
+        if move_x == 0 and move_y == 0:
+            return
+        
+        # Candidate positions after each step, and the leading edge at each
+        steps = np.arange(1, n_steps + 1) * (self.speed * dt * TILE_SIZE)
+        if move_x != 0:
+            positions = self.x + move_x * steps
+            edges = positions + (PLAYER_RADIUS if move_x > 0 else -PLAYER_RADIUS)
+            blocked = world.is_wall_array(edges, np.full(n_steps, self.y))
+        else:
+            positions = self.y + move_y * steps
+            edges = positions + (PLAYER_RADIUS if move_y > 0 else -PLAYER_RADIUS)
+            blocked = world.is_wall_array(np.full(n_steps, self.x), edges)
+        
+        # Every step before the first blocked one goes through; the blocked step
+        # itself stops against the wall, after which the player stays put
+        moved = int(blocked.argmax()) if blocked.any() else n_steps
+        if moved:
+            if move_x != 0:
+                self.x = float(positions[moved - 1])
+            else:
+                self.y = float(positions[moved - 1])
+        if moved < n_steps:
+            self.update(dt, move_x, move_y, world)
     
     def rotate(self, angle_delta):
         """Rotate player by angle_delta radians"""
-        self.angle += angle_delta
         # Keep angle in 0-2π range
-        while self.angle < 0:
-            self.angle += 2 * math.pi
-        while self.angle >= 2 * math.pi:
-            self.angle -= 2 * math.pi
+        self.angle = (self.angle + angle_delta) % TWO_PI
     
     def shoot(self):
         """Handle shooting"""
         if self.ammo > 0:
             self.ammo -= 1
-            print(f"🔫 Shot fired! Ammo remaining: {self.ammo}")
+            logger.debug("🔫 Shot fired! Ammo remaining: %d", self.ammo)
             # TODO: Create bullet object and add to world
             return True
         else:
-            print("🔫 Click! Out of ammo!")
+            logger.debug("🔫 Click! Out of ammo!")
             return False
     
     def reload(self):
         """Reload current weapon"""
         if self.ammo < self.max_ammo:
             self.ammo = self.max_ammo
-            print(f"🔄 Reloaded {self.current_weapon}")
+            logger.debug("🔄 Reloaded %s", self.current_weapon)
     
     def take_damage(self, damage):
         """Take damage from zombies"""
         self.health -= damage
         if self.health <= 0:
             self.health = 0
-            print("💀 Player down!")
+            logger.info("💀 Player down!")
             return True  # Player is down
         return False
     
     def add_points(self, points):
         """Add points to player score"""
         self.points += points
-        print(f"💰 +{points} points! Total: {self.points}")
+        logger.debug("💰 +%d points! Total: %d", points, self.points)
     
     def spend_points(self, cost):
         """Spend points if player has enough"""
@@ -88,4 +157,4 @@ class Player:
     
     def get_grid_pos(self):
         """Get player position in grid coordinates"""
-        return int(self.x // TILE_SIZE), int(self.y // TILE_SIZE)
+        return int(self.x) >> TILE_SHIFT, int(self.y) >> TILE_SHIFT
@@ -2,11 +2,22 @@
 Renderer class - Handles 3D raycasting and rendering
 """
 
+import logging
 import pygame
 import math
+import numpy as np
 from game.settings import *
 
+logger = logging.getLogger(__name__)
+
 class Renderer:
+    __slots__ = (
+        'screen', 'world', 'fov_rad', 'half_fov', 'angle_step',
+        'ray_cos', 'ray_sin', 'max_distance', 'map_grid', 'max_dda_steps',
+        'wall_colors', 'shade_lut', 'bucket_scale',
+        'minimap_scale', '_minimap_background', '_minimap_surface',
+    )
+    
     def __init__(self, screen, world):
         self.screen = screen
         self.world = world
@@ -16,97 +27,138 @@ class Renderer:
         self.half_fov = self.fov_rad / 2
         self.angle_step = self.fov_rad / RAY_COUNT
         
+        # Ray offsets from the view direction, as cos/sin so each frame only
+        # needs the player's angle rotated into them
+        ray_offsets = np.arange(RAY_COUNT) * self.angle_step - self.half_fov
+        self.ray_cos = np.cos(ray_offsets)
+        self.ray_sin = np.sin(ray_offsets)
+        self.max_distance = RENDER_DISTANCE * TILE_SIZE
+        
+        # Map as an array so all rays can be tested against it at once
+        self.map_grid = world.map_array
+        
+        # A ray crosses at most one grid line per step, so this bounds the DDA loop
+        self.max_dda_steps = self.map_grid.shape[0] + self.map_grid.shape[1]
+        
         # Wall textures (simple colored rectangles for now)
         self.wall_colors = {
             1: GRAY,      # Basic wall
             2: DARK_GRAY, # Different wall type
         }
         
-        print("✅ Renderer initialized")
-        print(f"   FOV: {FOV}°, Ray count: {RAY_COUNT}")
+        # Shaded wall colors by [wall type, distance bucket, side hit], so every
+        # column's color is one table lookup
+        base_colors = np.array([self.wall_colors.get(t, GRAY) for t in range(max(self.wall_colors) + 1)])
+        shade_factors = np.maximum(0.1, 1.0 - np.arange(SHADE_BUCKETS) / SHADE_BUCKETS)
+        side_factors = np.array([1.0, SIDE_SHADE])  # Horizontal grid lines are darker than vertical ones
+        self.shade_lut = (
+            base_colors[:, None, None, :] * shade_factors[None, :, None, None] * side_factors[None, None, :, None]
+        ).astype(np.uint8)
+        self.bucket_scale = SHADE_BUCKETS / self.max_distance
+        
+        # Minimap walls never change, so they are drawn once and copied each frame
+        self.minimap_scale = MINIMAP_SIZE / (world.get_map_width() * TILE_SIZE)
+        self._minimap_background = self._build_minimap()
+        self._minimap_surface = self._minimap_background.copy()
+        
+        logger.debug("✅ Renderer initialized")
+        logger.debug("   FOV: %s°, Ray count: %d", FOV, RAY_COUNT)
     
     def render_3d_view(self, player):
         """Render the 3D first-person view using raycasting"""
-        # Calculate starting angle for rays
-        start_angle = player.angle - self.half_fov
+        # Ray directions by angle addition from the precomputed offsets
+        cos_a = math.cos(player.angle)
+        sin_a = math.sin(player.angle)
+        dir_x = cos_a * self.ray_cos - sin_a * self.ray_sin
+        dir_y = sin_a * self.ray_cos + cos_a * self.ray_sin
         
-        for ray_index in range(RAY_COUNT):
-            # Calculate ray angle
-            ray_angle = start_angle + ray_index * self.angle_step
-            
-            # Cast ray and get distance to wall
-            distance, wall_type = self._cast_ray(player.x, player.y, ray_angle)
-            
-            # Calculate wall height on screen
-            if distance > 0:
-                wall_height = (TILE_SIZE / distance) * SCREEN_HEIGHT
-                wall_height = min(wall_height, SCREEN_HEIGHT)  # Cap wall height
-            else:
-                wall_height = SCREEN_HEIGHT
-            
-            # Calculate wall top and bottom
-            wall_top = (SCREEN_HEIGHT - wall_height) // 2
-            wall_bottom = wall_top + wall_height
-            
-            # Get wall color
-            wall_color = self.wall_colors.get(wall_type, GRAY)
-            
-            # Apply distance-based shading (darker = farther)
-            shade_factor = max(0.1, 1.0 - (distance / RENDER_DISTANCE))
-            shaded_color = tuple(int(c * shade_factor) for c in wall_color)
-            
-            # Calculate screen x position
-            screen_x = ray_index * (SCREEN_WIDTH // RAY_COUNT)
-            strip_width = SCREEN_WIDTH // RAY_COUNT
-            
-            # Draw ceiling (above wall)
-            if wall_top > 0:
-                ceiling_rect = pygame.Rect(screen_x, 0, strip_width, wall_top)
-                pygame.draw.rect(self.screen, (64, 64, 128), ceiling_rect)  # Dark blue ceiling
-            
-            # Draw wall
-            if wall_height > 0:
-                wall_rect = pygame.Rect(screen_x, wall_top, strip_width, wall_height)
-                pygame.draw.rect(self.screen, shaded_color, wall_rect)
-            
-            # Draw floor (below wall)
-            if wall_bottom < SCREEN_HEIGHT:
-                floor_rect = pygame.Rect(screen_x, wall_bottom, strip_width, SCREEN_HEIGHT - wall_bottom)
-                pygame.draw.rect(self.screen, (32, 32, 32), floor_rect)  # Dark gray floor
+        # Cast all rays at once and get distance to wall for each
+        distances, wall_types, sides = self._cast_rays(player.x, player.y, dir_x, dir_y)
+        
+        # Wall height on screen for every column (capped at screen height), from the
+        # distance along the view direction; the ray offset cosines undo fish-eye
+        view_distances = distances * self.ray_cos
+        wall_heights = np.minimum(TILE_SIZE * SCREEN_HEIGHT / np.maximum(view_distances, 1e-6), SCREEN_HEIGHT)
+        wall_tops = (SCREEN_HEIGHT - wall_heights) // 2
+        
+        # Apply distance-based shading (darker = farther)
+        buckets = np.minimum((distances * self.bucket_scale).astype(np.intp), SHADE_BUCKETS - 1)
+        shaded_colors = self.shade_lut[wall_types, buckets, sides.astype(np.intp)]
+        
+        # Ceiling and floor meet at the horizon, where walls are centered, so two
+        # fills cover every column's ceiling and floor before the walls go on top
+        half_height = SCREEN_HEIGHT // 2
+        self.screen.fill((64, 64, 128), (0, 0, SCREEN_WIDTH, half_height))  # Dark blue ceiling
+        self.screen.fill((32, 32, 32), (0, half_height, SCREEN_WIDTH, SCREEN_HEIGHT - half_height))  # Dark gray floor
+        
+        # Draw walls
+        strip_width = SCREEN_WIDTH // RAY_COUNT
+        for screen_x, wall_top, wall_height, shaded_color in zip(
+                range(0, RAY_COUNT * strip_width, strip_width),
+                wall_tops.tolist(), wall_heights.tolist(), shaded_colors.tolist()):
+            self.screen.fill(shaded_color, (screen_x, wall_top, strip_width, wall_height))
         
         # Draw crosshair
         self._draw_crosshair()
     
-    def _cast_ray(self, start_x, start_y, angle):
-        """Cast a ray and return distance to nearest wall"""
-        # Ray direction
-        dx = math.cos(angle)
-        dy = math.sin(angle)
-        
-        # Current position
-        x, y = start_x, start_y
-        
-        # Step size for ray marching
-        step_size = 4
-        
-        # March the ray
-        distance = 0
-        while distance < RENDER_DISTANCE * TILE_SIZE:
-            # Move ray forward
-            x += dx * step_size
-            y += dy * step_size
-            distance += step_size
+    def _cast_rays(self, start_x, start_y, dir_x, dir_y):
+        """Cast one ray per unit direction with a grid DDA over all rays at once
+        
+        Returns the distance to, type of and side hit (True for a horizontal
+        grid line) of the nearest wall for each ray.
+        """
+        ray_count = len(dir_x)
+        
+        # Ray length (in tiles) between successive vertical / horizontal grid lines
+        with np.errstate(divide='ignore'):
+            delta_x = np.where(dir_x == 0, 1e30, np.abs(1.0 / dir_x))
+            delta_y = np.where(dir_y == 0, 1e30, np.abs(1.0 / dir_y))
+        
+        # Start cell and the ray length to the first grid line on each axis
+        pos_x = start_x * INV_TILE_SIZE
+        pos_y = start_y * INV_TILE_SIZE
+        map_x = np.full(ray_count, int(pos_x), dtype=np.intp)
+        map_y = np.full(ray_count, int(pos_y), dtype=np.intp)
+        step_x = np.where(dir_x < 0, -1, 1)
+        step_y = np.where(dir_y < 0, -1, 1)
+        side_x = np.where(dir_x < 0, pos_x - map_x, map_x + 1 - pos_x) * delta_x
+        side_y = np.where(dir_y < 0, pos_y - map_y, map_y + 1 - pos_y) * delta_y
+        
+        distances = np.full(ray_count, float(RENDER_DISTANCE))
+        wall_types = np.zeros(ray_count, dtype=np.uint8)
+        sides = np.zeros(ray_count, dtype=bool)
+        done = np.zeros(ray_count, dtype=bool)
+        map_height, map_width = self.map_grid.shape
+        
+        for _ in range(self.max_dda_steps):
+            # Advance every unfinished ray across its nearest grid line
+            cross_x = (side_x < side_y) & ~done
+            cross_y = ~(side_x < side_y) & ~done
+            hit_distance = np.where(cross_x, side_x, side_y)
+            map_x += step_x * cross_x
+            map_y += step_y * cross_y
+            side_x = np.where(cross_x, side_x + delta_x, side_x)
+            side_y = np.where(cross_y, side_y + delta_y, side_y)
+            
+            # Look up the entered cells; out of bounds counts as a wall
+            in_bounds = (map_x >= 0) & (map_x < map_width) & (map_y >= 0) & (map_y < map_height)
+            cells = np.where(
+                in_bounds,
+                self.map_grid[np.clip(map_y, 0, map_height - 1), np.clip(map_x, 0, map_width - 1)],
+                1
+            )
+            
+            hit = (cells == 1) & ~done
+            distances[hit] = hit_distance[hit]
+            wall_types[hit] = cells[hit]
+            sides[hit] = cross_y[hit]
             
-            # Check if we hit a wall
-            if self.world.is_wall(x, y):
-                # Get wall type
-                grid_x = int(x // TILE_SIZE)
-                grid_y = int(y // TILE_SIZE)
-                wall_type = self.world.get_wall_at(grid_x, grid_y)
-                return distance, wall_type
-        
-        # No wall hit within render distance
-        return RENDER_DISTANCE * TILE_SIZE, 0
+            # Rays stop at a wall or once past render distance
+            done |= hit | (hit_distance >= RENDER_DISTANCE)
+            if done.all():
+                break
+        
+        return np.minimum(distances * TILE_SIZE, self.max_distance), wall_types, sides
     
     def _draw_crosshair(self):
         """Draw crosshair in center of screen"""
@@ -122,14 +174,13 @@ class Renderer:
                         (center_x, center_y - size), 
                         (center_x, center_y + size), 2)
     
-    def render_minimap(self, player):
-        """Render a small minimap (optional debug feature)"""
-        minimap_size = 200
-        minimap_scale = minimap_size / (self.world.get_map_width() * TILE_SIZE)
+    def _build_minimap(self):
+        """Draw the static minimap walls once; only the player marker changes per frame"""
+        minimap_scale = self.minimap_scale
         
         # Create minimap surface
-        minimap = pygame.Surface((minimap_size, minimap_size))
-        minimap.fill(BLACK)
+        background = pygame.Surface((MINIMAP_SIZE, MINIMAP_SIZE), 0, self.screen)
+        background.fill(BLACK)
         
         # Draw map
         for y in range(self.world.get_map_height()):
@@ -139,7 +190,17 @@ class Renderer:
                                      y * TILE_SIZE * minimap_scale,
                                      TILE_SIZE * minimap_scale, 
                                      TILE_SIZE * minimap_scale)
-                    pygame.draw.rect(minimap, WHITE, rect)
+                    pygame.draw.rect(background, WHITE, rect)
+        
+        return background
+    
+    def render_minimap(self, player):
+        """Render a small minimap (optional debug feature)"""
+        minimap_scale = self.minimap_scale
+        
+        # Start from the cached walls
+        minimap = self._minimap_surface
+        minimap.blit(self._minimap_background, (0, 0))
         
         # Draw player
         player_x = player.x * minimap_scale
@@ -152,4 +213,4 @@ class Renderer:
         pygame.draw.line(minimap, RED, (player_x, player_y), (end_x, end_y), 2)
         
         # Blit minimap to screen
-        self.screen.blit(minimap, (SCREEN_WIDTH - minimap_size - 10, 10))
+        self.screen.blit(minimap, (SCREEN_WIDTH - MINIMAP_SIZE - 10, 10))
@@ -15,7 +15,10 @@ MOUSE_SENSITIVITY = 0.002
 # Rendering settings
 FOV = 60  # Field of view in degrees
 RENDER_DISTANCE = 20
-RAY_COUNT = SCREEN_WIDTH // 2  # Number of rays for raycasting
+RAY_COUNT = SCREEN_WIDTH // 4  # Number of rays for raycasting (4px wall strips)
+SIDE_SHADE = 0.75  # Brightness of walls hit on a horizontal grid line
+SHADE_BUCKETS = 64  # Distance steps in the precomputed wall shading table
+MINIMAP_SIZE = 200
 
 # Colors (RGB)
 BLACK = (0, 0, 0)
@@ -34,11 +37,15 @@ HUD_BG_COLOR = (0, 0, 0, 128)  # Semi-transparent black
 
 # Map settings
 TILE_SIZE = 64
+TILE_SHIFT = TILE_SIZE.bit_length() - 1  # log2(TILE_SIZE), for shift-based grid lookups
+INV_TILE_SIZE = 1.0 / TILE_SIZE
+assert TILE_SIZE == 1 << TILE_SHIFT, "TILE_SIZE must be a power of two"
 MAP_WIDTH = 20
 MAP_HEIGHT = 15
 
 # Player settings
 PLAYER_SIZE = 16
+PLAYER_RADIUS = PLAYER_SIZE / 2
 PLAYER_START_X = 3 * TILE_SIZE
 PLAYER_START_Y = 3 * TILE_SIZE
 PLAYER_START_HEALTH = 100
@@ -2,9 +2,19 @@
 World class - Handles the game map, collision detection, and world objects
 """
 
+import logging
+import numpy as np
 from game.settings import *
 
+logger = logging.getLogger(__name__)
+
 class World:
+    __slots__ = (
+        'map_data', 'map_array', 'map_width', 'map_height', '_cells',
+        'zombies', 'bullets', 'pickups',
+        'wave', 'zombies_remaining', 'zombies_killed',
+    )
+    
     def __init__(self):
         # Simple Kino der Toten inspired map
         # 0 = empty space, 1 = wall
@@ -26,6 +36,12 @@ class World:
             [1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1],
         ]
         
+        # Map as a contiguous array for vectorized readers (the renderer), plus
+        # its raw bytes for scalar collision lookups, which are cheaper on bytes
+        self.map_array = np.ascontiguousarray(self.map_data, dtype=np.uint8)
+        self.map_height, self.map_width = self.map_array.shape
+        self._cells = self.map_array.tobytes()
+        
         # World objects
         self.zombies = []
         self.bullets = []
@@ -36,44 +52,58 @@ class World:
         self.zombies_remaining = 0
         self.zombies_killed = 0
         
-        print("✅ World initialized")
-        print(f"   Map size: {len(self.map_data[0])}x{len(self.map_data)}")
+        logger.debug("✅ World initialized")
+        logger.debug("   Map size: %dx%d", self.map_width, self.map_height)
     
     def is_wall(self, x, y):
         """Check if position (x, y) is a wall"""
-        # Convert world coordinates to grid coordinates
-        grid_x = int(x // TILE_SIZE)
-        grid_y = int(y // TILE_SIZE)
+        # Out of bounds is considered a wall
+        if x < 0 or y < 0:
+            return True
         
-        # Check bounds
-        if (grid_x < 0 or grid_x >= len(self.map_data[0]) or 
-            grid_y < 0 or grid_y >= len(self.map_data)):
-            return True  # Out of bounds is considered a wall
+        # Convert world coordinates to grid coordinates (TILE_SIZE is a power of two)
+        grid_x = int(x) >> TILE_SHIFT
+        grid_y = int(y) >> TILE_SHIFT
+        if grid_x >= self.map_width or grid_y >= self.map_height:
+            return True
+        
+        return self._cells[grid_y * self.map_width + grid_x] == 1
+    
+    def is_wall_array(self, xs, ys):
+        """Vectorized is_wall: which of the positions (xs[i], ys[i]) are walls"""
+        # Floor first so the arithmetic shift rounds negative coordinates down too
+        grid_x = np.floor(xs).astype(np.intp) >> TILE_SHIFT
+        grid_y = np.floor(ys).astype(np.intp) >> TILE_SHIFT
         
-        return self.map_data[grid_y][grid_x] == 1
+        # Out of bounds is considered a wall
+        in_bounds = (grid_x >= 0) & (grid_x < self.map_width) & (grid_y >= 0) & (grid_y < self.map_height)
+        cells = self.map_array[np.clip(grid_y, 0, self.map_height - 1), np.clip(grid_x, 0, self.map_width - 1)]
+        return ~in_bounds | (cells == 1)
     
     def get_wall_at(self, grid_x, grid_y):
         """Get wall value at grid position"""
-        if (grid_x < 0 or grid_x >= len(self.map_data[0]) or 
-            grid_y < 0 or grid_y >= len(self.map_data)):
+        if (grid_x < 0 or grid_x >= self.map_width or 
+            grid_y < 0 or grid_y >= self.map_height):
             return 1  # Out of bounds
-        return self.map_data[grid_y][grid_x]
+        return self._cells[grid_y * self.map_width + grid_x]
     
     def update(self, dt, player):
         """Update world objects"""
-        # Update zombies
-        for zombie in self.zombies[:]:  # Copy list to avoid modification issues
+        # Update zombies, keeping the survivors in one pass
+        alive = []
+        for zombie in self.zombies:
             zombie.update(dt, player, self)
-            if zombie.health <= 0:
-                self.zombies.remove(zombie)
+            if zombie.health > 0:
+                alive.append(zombie)
+            else:
                 self.zombies_killed += 1
                 player.add_points(POINTS_PER_KILL)
+        self.zombies = alive
         
         # Update bullets
-        for bullet in self.bullets[:]:
+        for bullet in self.bullets:
             bullet.update(dt, self)
-            if bullet.should_remove:
-                self.bullets.remove(bullet)
+        self.bullets = [bullet for bullet in self.bullets if not bullet.should_remove]
         
         # Check if wave is complete
         if len(self.zombies) == 0 and self.zombies_remaining == 0:
@@ -83,7 +113,7 @@ class World:
         """Start the next wave of zombies"""
         self.wave += 1
         self.zombies_remaining = self.wave * 6  # More zombies each wave
-        print(f"🌊 Wave {self.wave} starting! {self.zombies_remaining} zombies incoming!")
+        logger.info("🌊 Wave %d starting! %d zombies incoming!", self.wave, self.zombies_remaining)
     
     def spawn_zombie(self, x, y):
         """Spawn a zombie at position (x, y)"""
@@ -96,8 +126,8 @@ class World:
     
     def get_map_width(self):
         """Get map width in tiles"""
-        return len(self.map_data[0])
+        return self.map_width
     
     def get_map_height(self):
         """Get map height in tiles"""
-        return len(self.map_data)
+        return self.map_height
@@ -1,142 +1,116 @@
 #!/usr/bin/env python3
 """
 Test script for COD Zombies game mechanics
+
+Run with pytest (add `-n auto` when pytest-xdist is installed), or directly.
 """
 
+import copy
 import math
+import sys
+import numpy as np
+import pytest
 from game.player import Player
 from game.world import World
 from game.settings import *
 
-def test_player_movement():
+@pytest.fixture(scope="session")
+def world():
+    """One map shared by every test; none of them modify it"""
+    return World()
+
+@pytest.fixture(scope="session")
+def player_template():
+    """A freshly constructed player, built once and copied for each test"""
+    return Player(PLAYER_START_X, PLAYER_START_Y)
+
+@pytest.fixture
+def player(player_template):
+    # Player only holds immutable scalars, so a shallow copy is a fresh player
+    return copy.copy(player_template)
+
+def test_player_movement(world, player):
     """Test player movement and collision"""
-    print("🧪 Testing Player Movement...")
-    
-    world = World()
-    player = Player(PLAYER_START_X, PLAYER_START_Y)
-    
-    # Test initial position
-    initial_pos = (player.x, player.y)
-    print(f"   Initial position: {initial_pos}")
-    
     # Test movement (simulate 1 second at 60 FPS)
     dt = 1.0 / 60.0
-    for _ in range(60):
-        player.update(dt, 1, 0, world)  # Move right
+    player.update_batch(dt, 1, 0, world, 60)  # Move right
+    assert player.x == pytest.approx(PLAYER_START_X + PLAYER_SPEED * TILE_SIZE)
+    assert player.y == PLAYER_START_Y
     
-    print(f"   After moving right: ({player.x:.1f}, {player.y:.1f})")
+    # Keep walking right until the east wall stops the player flush against it
+    player.update_batch(dt, 1, 0, world, 600)
+    assert player.x == pytest.approx((world.map_width - 1) * TILE_SIZE - PLAYER_RADIUS)
+    assert not world.is_wall(player.x + PLAYER_RADIUS, player.y)
     
-    # Test collision (try to move into a wall)
-    wall_x, wall_y = 0, 0  # Top-left corner is a wall
+    # Test collision (try to move into a wall); every step is blocked from the
+    # first, so two single updates show the player stays put
     player.x, player.y = TILE_SIZE, TILE_SIZE  # Near wall
-    for _ in range(60):
+    for _ in range(2):
         player.update(dt, -1, 0, world)  # Try to move into wall
-    
-    print(f"   After trying to move into wall: ({player.x:.1f}, {player.y:.1f})")
-    print("   ✅ Movement and collision working!")
+        assert (player.x, player.y) == (TILE_SIZE, TILE_SIZE)
 
-def test_player_shooting():
+def test_player_shooting(player):
     """Test player shooting mechanics"""
-    print("🧪 Testing Player Shooting...")
-    
-    player = Player(PLAYER_START_X, PLAYER_START_Y)
-    
-    print(f"   Initial ammo: {player.ammo}")
-    
-    # Test shooting
-    for i in range(player.max_ammo + 2):  # Shoot more than max ammo
-        result = player.shoot()
-        print(f"   Shot {i+1}: {'Hit' if result else 'Miss/Empty'} - Ammo: {player.ammo}")
+    # Test shooting until the magazine is empty
+    shoot = player.shoot
+    shots = 0
+    while shoot():
+        shots += 1
+    assert shots == player.max_ammo
+    assert player.ammo == 0
+    assert not shoot()  # Still empty
     
     # Test reload
     player.reload()
-    print(f"   After reload: {player.ammo}")
-    print("   ✅ Shooting mechanics working!")
+    assert player.ammo == player.max_ammo
 
-def test_player_rotation():
+def test_player_rotation(player):
     """Test player rotation"""
-    print("🧪 Testing Player Rotation...")
-    
-    player = Player(PLAYER_START_X, PLAYER_START_Y)
+    assert player.angle == 0
     
-    print(f"   Initial angle: {math.degrees(player.angle):.1f}°")
-    
-    # Test rotation
     player.rotate(math.pi / 2)  # 90 degrees
-    print(f"   After 90° rotation: {math.degrees(player.angle):.1f}°")
+    assert math.degrees(player.angle) == pytest.approx(90)
     
     player.rotate(math.pi)  # Another 180 degrees
-    print(f"   After another 180° rotation: {math.degrees(player.angle):.1f}°")
+    assert math.degrees(player.angle) == pytest.approx(270)
     
     # Test angle wrapping
     player.rotate(math.pi * 3)  # 540 degrees (should wrap)
-    print(f"   After 540° rotation (should wrap): {math.degrees(player.angle):.1f}°")
-    print("   ✅ Rotation mechanics working!")
+    assert math.degrees(player.angle) == pytest.approx(90)
+
+COLLISION_CASES = [
+    (0, 0, True),  # Top-left corner (wall)
+    (TILE_SIZE * 3, TILE_SIZE * 3, False),  # Player start (open)
+    (TILE_SIZE * 10, TILE_SIZE * 7, False),  # Center area (open)
+    (-10, -10, True),  # Out of bounds (wall)
+    (TILE_SIZE * 100, TILE_SIZE * 100, True),  # Way out of bounds (wall)
+]
 
-def test_world_collision():
+@pytest.mark.parametrize("x, y, expected", COLLISION_CASES)
+def test_world_collision(world, x, y, expected):
     """Test world collision detection"""
-    print("🧪 Testing World Collision...")
-    
-    world = World()
-    
-    # Test wall detection
-    test_positions = [
-        (0, 0),  # Top-left corner (wall)
-        (TILE_SIZE * 3, TILE_SIZE * 3),  # Player start (open)
-        (TILE_SIZE * 10, TILE_SIZE * 7),  # Center area (open)
-        (-10, -10),  # Out of bounds (wall)
-        (TILE_SIZE * 100, TILE_SIZE * 100),  # Way out of bounds (wall)
-    ]
-    
-    for x, y in test_positions:
-        is_wall = world.is_wall(x, y)
-        grid_x, grid_y = int(x // TILE_SIZE), int(y // TILE_SIZE)
-        print(f"   Position ({x}, {y}) -> Grid ({grid_x}, {grid_y}): {'Wall' if is_wall else 'Open'}")
-    
-    print("   ✅ Collision detection working!")
+    assert world.is_wall(x, y) is expected
 
-def test_points_system():
+def test_world_collision_batch(world):
+    """Test that the vectorized wall probe agrees with is_wall in one call"""
+    xs, ys, expected = (np.array(column) for column in zip(*COLLISION_CASES))
+    assert world.is_wall_array(xs, ys).tolist() == expected.tolist()
+
+def test_points_system(player):
     """Test points system"""
-    print("🧪 Testing Points System...")
-    
-    player = Player(PLAYER_START_X, PLAYER_START_Y)
-    
-    print(f"   Initial points: {player.points}")
+    initial_points = player.points
     
     # Test adding points
     player.add_points(POINTS_PER_KILL)
-    print(f"   After kill bonus: {player.points}")
+    assert player.points == initial_points + POINTS_PER_KILL
     
     # Test spending points
-    cost = 100
-    can_spend = player.spend_points(cost)
-    print(f"   Can spend {cost} points: {can_spend}")
-    print(f"   Points after spending: {player.points}")
+    assert player.spend_points(100) is True
+    assert player.points == initial_points + POINTS_PER_KILL - 100
     
     # Test spending more than available
-    can_spend = player.spend_points(1000)
-    print(f"   Can spend 1000 points: {can_spend}")
-    print(f"   Points unchanged: {player.points}")
-    print("   ✅ Points system working!")
-
-def main():
-    """Run all tests"""
-    print("🎮 COD Zombies Game - Mechanics Test Suite")
-    print("=" * 50)
-    
-    test_player_movement()
-    print()
-    test_player_shooting()
-    print()
-    test_player_rotation()
-    print()
-    test_world_collision()
-    print()
-    test_points_system()
-    
-    print("=" * 50)
-    print("🎉 All tests completed!")
-    print("✅ Core game mechanics are functional!")
+    assert player.spend_points(1000) is False
+    assert player.points == initial_points + POINTS_PER_KILL - 100
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(pytest.main([__file__, "-q"]))